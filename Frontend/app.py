@@ -1,7 +1,26 @@
+import os
+import sys
+
+import pandas as pd
 import streamlit as st
-import requests
 from PIL import Image
 
+from backend_client import BackendClient
+
+# Business rules are shared with the backend (rules.py in the repo root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rules import REJECTION_RULES  # noqa: E402
+
+# Form warnings per rule, in the order they are shown
+RULE_WARNINGS = {
+    'low_credit_score': '⚠️ Credit score is below 650.',
+    'low_income': '⚠️ Annual income is quite low.',
+    'high_loan_to_income': '⚠️ Loan amount is high compared to income.',
+    'short_job_duration': '⚠️ Less than 2 years at current job.',
+    'bad_credit_history': '⚠️ Bad credit history.',
+    'low_collateral': '⚠️ Collateral value is low compared to loan amount.',
+}
+
 # --- Branding and Header ---
 st.set_page_config(page_title='Loan Approval AI', page_icon=':money_with_wings:', layout='wide')
 
@@ -12,6 +31,17 @@ st.markdown('💸 **Loan Approval AI System**', unsafe_allow_html=True)
 st.markdown('AI-powered, explainable, and professional loan application analysis')
 st.markdown('---')
 
+# --- Backend client ---
+@st.cache_resource
+def get_client():
+    # One connection pool for every session in this Streamlit process
+    return BackendClient()
+
+@st.cache_data(ttl=600, max_entries=1000, show_spinner=False)
+def cached_predict(payload):
+    # Resubmitting an unchanged form is answered without a backend call
+    return get_client().predict(payload)
+
 # --- Helper for readable feature values ---
 def readable_feature(feature, value):
     if feature == 'property_area':
@@ -83,19 +113,15 @@ with st.form('loan_form'):
     )
 
     # --- Validation Feedback ---
-    warnings = []
-    if credit_score < 650:
-        warnings.append('⚠️ Credit score is below 650.')
-    if annual_income < 200:
-        warnings.append('⚠️ Annual income is quite low.')
-    if loan_amount > annual_income * 0.6:
-        warnings.append('⚠️ Loan amount is high compared to income.')
-    if years_at_job < 2:
-        warnings.append('⚠️ Less than 2 years at current job.')
-    if credit_history == 0:
-        warnings.append('⚠️ Bad credit history.')
-    if collateral_value < loan_amount * 0.5:
-        warnings.append('⚠️ Collateral value is low compared to loan amount.')
+    fired = REJECTION_RULES.names(REJECTION_RULES.evaluate_record({
+        'credit_score': credit_score,
+        'credit_history': credit_history,
+        'annual_income': annual_income,
+        'loan_amount': loan_amount,
+        'years_at_job': years_at_job,
+        'collateral_value': collateral_value,
+    }))
+    warnings = [message for name, message in RULE_WARNINGS.items() if name in fired]
     if warnings:
         st.markdown('<div style="color:#d9534f; font-weight:bold;">' + '<br>'.join(warnings) + '</div>', unsafe_allow_html=True)
 
@@ -123,8 +149,7 @@ if submitted:
     }
     with st.spinner('Analyzing your application with AI...'):
         try:
-            response = requests.post('http://localhost:5000/predict', json=data)
-            result_data = response.json()
+            result_data = cached_predict(data)
             
             if 'error' in result_data:
                 st.error(f'Backend Error: {result_data["error"]}')
@@ -182,5 +207,30 @@ if submitted:
         except Exception as e:
             st.error(f'Error: {e}')
 
+# --- Batch Upload ---
+with st.expander('📂 Batch upload'):
+    st.markdown('Score a CSV of applications with the same columns as the form above.')
+    uploaded = st.file_uploader('Applications CSV', type='csv')
+    chunk_rows = st.number_input('Rows per request', min_value=50, max_value=5000, value=500, step=50)
+    if uploaded is not None and st.button('📊 Score file'):
+        applications = pd.read_csv(uploaded).to_dict('records')
+        progress = st.progress(0.0, text=f'Scoring {len(applications)} applications...')
+        results = []
+        try:
+            for done, chunk_results in get_client().score_chunks(applications, chunk_rows=int(chunk_rows)):
+                results.extend(chunk_results)
+                progress.progress(done / len(applications), text=f'{done} / {len(applications)} applications scored')
+        except Exception as e:
+            st.error(f'Error: {e}')
+        if results:
+            scored = pd.DataFrame(applications[:len(results)])
+            scored['prediction'] = [r['prediction'] for r in results]
+            scored['approval_probability'] = [r.get('approval_probability') for r in results]
+            scored['reasons'] = ['; '.join(r.get('reasons', [])) for r in results]
+            scored['emi'] = [r.get('bank_summary', {}).get('EMI (per month)') for r in results]
+            st.metric('Approved', f"{(scored['prediction'] == 'Approved').mean():.1%}")
+            st.dataframe(scored, use_container_width=True)
+            st.download_button('⬇️ Download results', scored.to_csv(index=False), 'loan_decisions.csv', 'text/csv')
+
 st.markdown('---')
 st.markdown('<center><small>Powered by AI | Built with Streamlit</small></center>', unsafe_allow_html=True) 
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""HTTP client for the loan API, shared by every Streamlit session.
+
+One pooled ``requests.Session`` per process: connections are reused across
+reruns and users, capped at ``pool_size`` (extra callers wait for a free
+connection instead of opening more), and every call has a timeout. Idempotent
+scoring calls are retried on connection errors and 502/503/504.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:5000')
+
+
+class BackendClient:
+    def __init__(self, base_url=BACKEND_URL, connect_timeout=3.05, read_timeout=30, retries=3, pool_size=8):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            # Scoring has no side effects, so POSTs are safe to retry
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _post(self, path, payload, explain):
+        params = None if explain is None else {'explain': '1' if explain else '0'}
+        response = self.session.post(self.base_url + path, json=payload, params=params, timeout=self.timeout)
+        # 4xx bodies carry the API's validation message; server errors are raised
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response.json()
+
+    def predict(self, application, explain=None):
+        """Decision for one application; ``explain=None`` keeps the server default."""
+        return self._post('/predict', application, explain)
+
+    def predict_batch(self, applications, explain=False):
+        """Decisions for a list of applications in one request."""
+        result = self._post('/predict/batch', applications, explain)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result['results']
+
+    def score_chunks(self, applications, chunk_rows=500, in_flight=4, explain=False):
+        """Score many applications in chunks, keeping up to ``in_flight`` requests pipelined.
+
+        Yields ``(rows_done, results)`` per chunk, in input order, so callers
+        can report progress while later chunks are still being scored.
+        """
+        chunks = [applications[i:i + chunk_rows] for i in range(0, len(applications), chunk_rows)]
+        in_flight = max(1, min(in_flight, self.pool_size))
+        done = 0
+        pending = deque()
+        with ThreadPoolExecutor(in_flight) as pool:
+            for chunk in chunks:
+                pending.append((len(chunk), pool.submit(self.predict_batch, chunk, explain)))
+                if len(pending) >= in_flight:
+                    size, future = pending.popleft()
+                    done += size
+                    yield done, future.result()
+            while pending:
+                size, future = pending.popleft()
+                done += size
+                yield done, future.result()
+
+    def health(self):
+        return self.session.get(self.base_url + '/health', timeout=self.timeout).json()
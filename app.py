@@ -1,154 +1,497 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
+import hmac
+import json
+import os
+import threading
+import time
 import joblib
 import pandas as pd
 import numpy as np
-import shap
+from decision_cache import DecisionCache, SqliteStore
+from explanations import CachedExplainer, top_k_reasons
+from forest_engine import FlatForest
+from instrumentation import Registry, StageTimer, configure_logging
+from label_lookup import CompiledEncoders, UnknownCategoryError
+from loan_terms import calculate_loan_terms, loan_terms
+from microbatch import MicroBatcher
+from model_store import file_sha256, load_compact
+from rules import REJECTION_RULES
 
 app = Flask(__name__)
-print("Loading model and encoders...")
-model = joblib.load('professional_loan_model.pkl')
-le_dict = joblib.load('professional_label_encoders.pkl')
-print("Model and encoders loaded successfully!")
-explainer = shap.TreeExplainer(model)
+logger = configure_logging('loan_api')
+metrics = Registry()
+request_latency = metrics.histogram('loan_api_request_seconds', 'End-to-end request latency', ('endpoint', 'status'))
+timer = StageTimer(metrics.histogram('loan_api_stage_seconds', 'Time spent in each request stage', ('stage',)))
+MODEL_PATH = os.environ.get('MODEL_PATH', 'professional_loan_model.pkl')
+ENCODERS_PATH = os.environ.get('ENCODERS_PATH', 'professional_label_encoders.pkl')
+COMPACT_MODEL_DIR = os.environ.get('COMPACT_MODEL_DIR', 'professional_loan_compact')
+
+class ModelBundle:
+    """Everything one model version serves with, swapped as a unit on reload.
+
+    Handlers read the module-level ``bundle`` once per request, so a reload
+    never mixes the encoders of one model with the forest of another and
+    in-flight requests finish on the bundle they started with.
+    """
+
+    def __init__(self, forest, encoders, meta, model=None, fingerprint=None):
+        self.forest = forest
+        self.encoders = encoders
+        self.meta = meta
+        # The sklearn model is only needed for SHAP and large batches, so it is
+        # unpickled on first use when the compact model is available
+        self.model = model
+        self.fingerprint = fingerprint
+        # Column of the Approved class: SHAP reasons talk about approval probability
+        self.approved_index = int(np.flatnonzero(encoders.decode('loan_status', forest.classes) == 'Approved')[0])
+        self.version = meta.get('model_sha256') or file_sha256(MODEL_PATH)
+        self.explainer = CachedExplainer(factory=self.build_explainer, cache_size=int(os.environ.get('SHAP_CACHE_SIZE', 4096)),
+                                         class_index=self.approved_index)
+        self._lock = threading.Lock()
+        self._self_tested = False
+
+    def get_model(self):
+        if self.model is None:
+            with self._lock:
+                if self.model is None:
+                    logger.info("Loading sklearn model from %s", MODEL_PATH)
+                    loaded = joblib.load(MODEL_PATH)
+                    expected = self.meta.get('model_sha256')
+                    if expected and file_sha256(MODEL_PATH) != expected:
+                        logger.warning("%s does not match the compact model in %s; re-export it", MODEL_PATH, COMPACT_MODEL_DIR)
+                    self.model = loaded
+        return self.model
+
+    def self_test(self):
+        """Score one row through the forest and decode it; raises if the bundle cannot serve."""
+        if not self._self_tested:
+            X = np.zeros((1, len(model_features)))
+            self.encoders.decode('loan_status', self.forest.predict(X))
+            self._self_tested = True
+
+    def build_explainer(self):
+        import shap  # slow to import, so only on the first explanation
+        return shap.TreeExplainer(self.get_model())
+
+def model_fingerprint():
+    # Identity of the files a reload would read; training replaces them by rename
+    path = os.path.join(COMPACT_MODEL_DIR, 'forest.json') if os.path.isdir(COMPACT_MODEL_DIR) else MODEL_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_ino, stat.st_mtime_ns)
+
+def load_bundle():
+    # Fingerprint first, so files replaced while loading are picked up next time
+    fingerprint = model_fingerprint()
+    if os.path.isdir(COMPACT_MODEL_DIR):
+        # Raw arrays, memory-mapped: no unpickling and pages shared between workers
+        forest, encoders, meta = load_compact(COMPACT_MODEL_DIR)
+        return ModelBundle(forest, encoders, meta, fingerprint=fingerprint)
+    model = joblib.load(MODEL_PATH)
+    # Compile encoders into plain lookup tables once, at load time, and keep a
+    # flat-array copy of the forest for low-latency single-row scoring
+    return ModelBundle(FlatForest.from_sklearn(model), CompiledEncoders(joblib.load(ENCODERS_PATH)), {}, model, fingerprint)
+
+logger.info("Loading model and encoders...")
+bundle = load_bundle()
+logger.info("Model and encoders loaded successfully!")
+PRELOAD_EXPLAINER = os.environ.get('PRELOAD_EXPLAINER', '0') == '1'
+if PRELOAD_EXPLAINER:
+    bundle.explainer.load()
+
+def get_model():
+    return bundle.get_model()
+# Responses for applications seen before, namespaced by the model's hash so a
+# new model never serves old decisions; DECISION_CACHE_DB shares them between workers
+decision_cache = None
+if int(os.environ.get('DECISION_CACHE_SIZE', 10000)) > 0:
+    decision_cache = DecisionCache(
+        maxsize=int(os.environ.get('DECISION_CACHE_SIZE', 10000)),
+        ttl=float(os.environ.get('DECISION_CACHE_TTL', 3600)),
+        model_version=bundle.version,
+        store=SqliteStore(os.environ['DECISION_CACHE_DB']) if os.environ.get('DECISION_CACHE_DB') else None
+    )
+# With lazy explanations, SHAP reasons are only computed when asked for (?explain=1 or /explain)
+LAZY_EXPLANATIONS = os.environ.get('LAZY_EXPLANATIONS', '0') == '1'
 
 model_features = ['age', 'gender', 'married', 'dependents', 'education', 'employment_type', 'years_at_job', 'annual_income', 'coapplicant_income', 'credit_score', 'credit_history', 'loan_amount', 'loan_amount_term', 'loan_purpose', 'property_area', 'collateral_value']
 
 # Helper to encode input using label encoders
-def encode_input(data):
-    print("Encoding input data...")
-    encoded = {}
-    for f in model_features:
-        if f in le_dict:
-            encoded[f] = le_dict[f].transform([data[f]])[0]
-        else:
-            encoded[f] = data[f]
-    print("Encoded data:", encoded)
+def encode_input(data, current=None):
+    encoded = (current or bundle).encoders.encode_record(data, model_features)
+    logger.debug("Encoded data: %s", encoded)
     return encoded
 
+def rejection_reasons(code):
+    return REJECTION_RULES.reasons(code) or ['General risk factors based on application']
+
 def explain_rejection(data):
-    reasons = []
-    if data.get('credit_score', 700) < 650:
-        reasons.append('Low credit score')
-    if data.get('credit_history', 'Good') in ['Bad', 0]:
-        reasons.append('Bad credit history')
-    if int(data.get('annual_income', 500)) < 200:
-        reasons.append('Low annual income')
-    if int(data.get('loan_amount', 150)) > int(data.get('annual_income', 500)) * 0.6:
-        reasons.append('Loan amount is high compared to income')
-    if int(data.get('years_at_job', 5)) < 2:
-        reasons.append('Short job duration')
-    if int(data.get('collateral_value', 0)) < int(data.get('loan_amount', 150)) * 0.5:
-        reasons.append('Insufficient collateral value')
-    return reasons or ['General risk factors based on application']
-
-def calculate_loan_terms(loan_amount, loan_amount_term, credit_score):
-    # Simple interest rate logic based on credit score
-    if credit_score >= 800:
-        interest_rate = 7.0
-    elif credit_score >= 750:
-        interest_rate = 8.0
-    elif credit_score >= 700:
-        interest_rate = 9.0
-    elif credit_score >= 650:
-        interest_rate = 10.5
+    return rejection_reasons(REJECTION_RULES.evaluate_record(data))
+
+def get_shap_reasons(input_df, current=None):
+    shap_values = (current or bundle).explainer.shap_values(input_df.to_numpy())
+    return top_k_reasons(shap_values[0], input_df.iloc[0].tolist(), model_features)
+
+def score_rows(items):
+    # Score coalesced (bundle, encoded_row, explain) items, one matrix per bundle:
+    # a batch can straddle a reload, and each row must be scored by the model
+    # whose encoders produced it
+    groups = {}
+    for i, (current, _, _) in enumerate(items):
+        groups.setdefault(id(current), (current, []))[1].append(i)
+    results = [None] * len(items)
+    for current, indices in groups.values():
+        X = np.array([items[i][1] for i in indices], dtype=float)
+        proba = current.forest.predict_proba(X)
+        to_explain = [j for j, i in enumerate(indices) if items[i][2]]
+        shap_rows = {}
+        if to_explain:
+            shap_rows = dict(zip(to_explain, current.explainer.shap_values(X[to_explain])))
+        for j, i in enumerate(indices):
+            results[i] = (proba[j], shap_rows.get(j))
+    return results
+
+# Coalesce concurrent /predict calls into batches (useful with threaded workers)
+batcher = None
+if os.environ.get('MICROBATCH', '0') == '1':
+    batcher = MicroBatcher(
+        score_rows,
+        max_wait_ms=float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 5)),
+        max_batch_size=int(os.environ.get('MICROBATCH_MAX_BATCH', 64))
+    )
+
+# Hot reload: train.py --update replaces the model files by rename; a new
+# bundle is loaded beside the old one and swapped in with one assignment
+model_reloads = metrics.counter('loan_api_model_reloads_total', 'Model reload attempts', ('outcome',))
+MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 0))
+_reload_lock = threading.Lock()
+_watcher_pid = None
+
+def reload_model():
+    """Load the model files again and swap them in; returns False if unchanged."""
+    global bundle
+    with _reload_lock:
+        new = load_bundle()
+        previous = bundle
+        if new.version == previous.version:
+            previous.fingerprint = new.fingerprint
+            return False
+        if int(new.forest.feature.max()) >= len(model_features):
+            raise ValueError(f'model uses {int(new.forest.feature.max()) + 1} features, the API sends {len(model_features)}')
+        new.self_test()
+        # Warm what the old bundle had loaded so the swap adds no latency
+        if previous.model is not None:
+            new.get_model()
+        if previous.explainer.loaded:
+            new.explainer.load()
+        bundle = new
+        if decision_cache is not None:
+            decision_cache.set_model_version(new.version)
+    logger.info("Model reloaded: %s -> %s (%d trees)", previous.version[:12], new.version[:12], new.forest.n_trees)
+    return True
+
+def _watch_model_files():
+    failed = None
+    while True:
+        time.sleep(MODEL_RELOAD_INTERVAL)
+        fingerprint = model_fingerprint()
+        if fingerprint is None or fingerprint in (bundle.fingerprint, failed):
+            continue
+        try:
+            model_reloads.inc('success' if reload_model() else 'unchanged')
+        except Exception:
+            # Keep serving the current model; retry once the files change again
+            failed = fingerprint
+            model_reloads.inc('error')
+            logger.exception("Model reload failed; still serving %s", bundle.version[:12])
+
+def ensure_model_watcher():
+    # Started per process, like the micro-batcher, so forked workers each poll
+    global _watcher_pid
+    if MODEL_RELOAD_INTERVAL > 0 and _watcher_pid != os.getpid():
+        _watcher_pid = os.getpid()
+        threading.Thread(target=_watch_model_files, name='model-watcher', daemon=True).start()
+
+def _reset_reload_lock():
+    # A fork can happen while another thread holds the lock
+    global _reload_lock
+    _reload_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_reload_lock)
+
+def wants_explanations():
+    flag = request.args.get('explain')
+    if flag is None:
+        return not LAZY_EXPLANATIONS
+    return flag.lower() in ('1', 'true', 'yes')
+
+def build_response(data, result, terms=None, reasons=None):
+    response = {'prediction': result}
+    if result == 'Approved':
+        # Calculate loan terms (batch callers pass them in precomputed)
+        if terms is None:
+            with timer.stage('loan_terms'):
+                terms = calculate_loan_terms(
+                    float(data['loan_amount']),
+                    int(data['loan_amount_term']),
+                    int(data['credit_score'])
+                )
+        response['bank_summary'] = {
+            'Interest Rate (%)': terms['interest_rate'],
+            'EMI (per month)': terms['emi'],
+            'Total Payment': terms['total_payment'],
+            'Loan Amount': float(data['loan_amount']) * 1000,
+            'Loan Term (months)': int(data['loan_amount_term'])
+        }
+        response['message'] = (
+            f"Congratulations! Your loan is approved.\n"
+            f"Interest Rate: {terms['interest_rate']}% per annum\n"
+            f"EMI: {terms['emi']} per month\n"
+            f"Total Payment: {terms['total_payment']}\n"
+            f"Loan Amount: {float(data['loan_amount']) * 1000}\n"
+            f"Loan Term: {int(data['loan_amount_term'])} months"
+        )
     else:
-        interest_rate = 13.0
-    # EMI calculation
-    P = loan_amount * 1000  # convert to actual amount
-    N = loan_amount_term
-    R = interest_rate / (12 * 100)
-    EMI = (P * R * (1 + R) ** N) / ((1 + R) ** N - 1) if R > 0 else P / N
-    total_payment = EMI * N
-    return {
-        'interest_rate': round(interest_rate, 2),
-        'emi': round(EMI, 2),
-        'total_payment': round(total_payment, 2)
-    }
-
-def get_shap_reasons(input_df):
-    shap_values = explainer.shap_values(input_df)
-    print('shap_values type:', type(shap_values))
-    print('shap_values shape:', getattr(shap_values, 'shape', 'no shape'))
-    if isinstance(shap_values, list):
-        print('shap_values[1] type:', type(shap_values[1]))
-        print('shap_values[1] shape:', getattr(shap_values[1], 'shape', 'no shape'))
-        shap_values = shap_values[1]
-    print('shap_values[0] type:', type(shap_values[0]))
-    print('shap_values[0] shape:', getattr(shap_values[0], 'shape', 'no shape'))
-    # Ensure we have a 1D array of floats for the first sample
-    shap_vals = shap_values[0]
-    # If shap_vals is not a 1D array, flatten it
-    if hasattr(shap_vals, 'flatten'):
-        shap_vals = shap_vals.flatten()
-    # If any element is an array, extract the scalar
-    shap_vals = [float(s[0]) if hasattr(s, '__len__') and not isinstance(s, str) and len(s) == 1 else float(s) for s in shap_vals]
-    feature_importance = pd.DataFrame([
-        {'feature': f, 'shap_value': s, 'value': v}
-        for f, s, v in zip(model_features, shap_vals, input_df.iloc[0].tolist())
-    ])
-    feature_importance['abs_shap'] = feature_importance['shap_value'].abs()
-    top_features = feature_importance.sort_values('abs_shap', ascending=False).head(3)
-    explanations = []
-    for _, row in top_features.iterrows():
-        direction = 'increased' if row['shap_value'] > 0 else 'decreased'
-        explanations.append(f"{row['feature']} ({row['value']}) {direction} the approval probability")
-    return explanations
+        response['reasons'] = reasons if reasons is not None else explain_rejection(data)
+    return response
+
+# Vectorized encoding of many applications into one feature matrix
+def encode_batch(records, current=None):
+    columns = (current or bundle).encoders.encode_columns(records, model_features)
+    return pd.DataFrame(columns, columns=model_features)
+
+def parse_batch_body():
+    # Accept either a JSON array or newline-delimited JSON objects
+    body = request.get_data(as_text=True).strip()
+    if not body:
+        return []
+    if body.startswith('['):
+        records = json.loads(body)
+    else:
+        records = [json.loads(line) for line in body.splitlines() if line.strip()]
+    if not all(isinstance(r, dict) for r in records):
+        raise ValueError('batch must contain JSON objects')
+    return records
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    ensure_model_watcher()
+
+@app.after_request
+def record_request_latency(response):
+    start = getattr(g, 'request_start', None)
+    if start is not None and request.endpoint != 'prometheus_metrics':
+        # Route templates, not raw paths, so unknown URLs cannot create new series
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(time.perf_counter() - start, route, str(response.status_code))
+    return response
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    print("Received prediction request!")
-    data = request.get_json()
-    print("Input data:", data)
+    with timer.stage('decode'):
+        data = request.get_json()
+    logger.debug("Input data: %s", data)
+    current = bundle
     
     try:
         # Encode input
-        encoded = encode_input(data)
-        input_df = pd.DataFrame([encoded], columns=model_features)
-        print("Input DataFrame:", input_df)
+        with timer.stage('encode'):
+            encoded = encode_input(data, current)
         
-        prediction = model.predict(input_df)[0]
-        print("Raw prediction:", prediction)
+        explain = wants_explanations()
+        # Looked up on the encoded values alone: a hit skips building the frame
+        if decision_cache is not None:
+            with timer.stage('decision_cache'):
+                cache_key = list(encoded.values())
+                cached = decision_cache.get(current.version, cache_key, explain)
+            if cached is not None:
+                return jsonify(cached)
         
-        result = le_dict['loan_status'].inverse_transform([prediction])[0]
-        print("Final result:", result)
+        with timer.stage('to_frame'):
+            input_df = pd.DataFrame([encoded], columns=model_features)
         
-        response = {'prediction': result}
-        if result == 'Approved':
-            # Calculate loan terms
-            terms = calculate_loan_terms(
-                float(data['loan_amount']),
-                int(data['loan_amount_term']),
-                int(data['credit_score'])
-            )
-            response['bank_summary'] = {
-                'Interest Rate (%)': terms['interest_rate'],
-                'EMI (per month)': terms['emi'],
-                'Total Payment': terms['total_payment'],
-                'Loan Amount': float(data['loan_amount']) * 1000,
-                'Loan Term (months)': int(data['loan_amount_term'])
-            }
-            response['message'] = (
-                f"Congratulations! Your loan is approved.\n"
-                f"Interest Rate: {terms['interest_rate']}% per annum\n"
-                f"EMI: {terms['emi']} per month\n"
-                f"Total Payment: {terms['total_payment']}\n"
-                f"Loan Amount: {float(data['loan_amount']) * 1000}\n"
-                f"Loan Term: {int(data['loan_amount_term'])} months"
-            )
-        else:
-            response['reasons'] = explain_rejection(data)
+        shap_row = None
+        # With micro-batching this stage also covers queueing and batched SHAP
+        with timer.stage('predict'):
+            if batcher is not None:
+                proba, shap_row = batcher.submit((current, input_df.to_numpy()[0], explain))
+                prediction = current.forest.classes[proba.argmax()]
+            else:
+                prediction = current.forest.predict(input_df.to_numpy())[0]
+        
+        with timer.stage('inverse_transform'):
+            result = current.encoders.decode('loan_status', [prediction])[0]
+        logger.debug("Prediction: %s (%s)", result, prediction)
+        
+        response = build_response(data, result)
         
         # SHAP explanations
-        response['shap_reasons'] = get_shap_reasons(input_df)
+        if explain:
+            with timer.stage('shap'):
+                if shap_row is not None:
+                    response['shap_reasons'] = top_k_reasons(shap_row, input_df.iloc[0].tolist(), model_features)
+                else:
+                    response['shap_reasons'] = get_shap_reasons(input_df, current)
         
-        print("Sending response:", response)
+        if decision_cache is not None:
+            decision_cache.put(current.version, cache_key, explain, response)
+        logger.debug("Sending response: %s", response)
         return jsonify(response)
         
+    except (KeyError, UnknownCategoryError) as e:
+        logger.info("Rejected invalid application: %s", e)
+        return jsonify({'error': f'Invalid application: {e}'}), 400
+    except Exception as e:
+        logger.exception("Error occurred: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        records = parse_batch_body()
+    except ValueError as e:
+        return jsonify({'error': f'Invalid batch body: {e}'}), 400
+    logger.debug("Received batch prediction request with %d applications", len(records))
+    if not records:
+        return jsonify({'results': []})
+    current = bundle
+    
+    try:
+        try:
+            with timer.stage('encode'):
+                input_df = encode_batch(records, current)
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': f'Invalid application: {e}'}), 400
+        
+        # One forest pass and one SHAP pass for the whole batch
+        with timer.stage('predict'):
+            batch_model = current.get_model()
+            proba = batch_model.predict_proba(input_df)
+            predictions = batch_model.classes_[proba.argmax(axis=1)]
+        with timer.stage('inverse_transform'):
+            labels = current.encoders.decode('loan_status', predictions)
+        # Terms are only quoted on approvals
+        approved = np.flatnonzero(labels == 'Approved')
+        with timer.stage('loan_terms'):
+            batch_terms = loan_terms(
+                [float(records[i]['loan_amount']) for i in approved],
+                [int(records[i]['loan_amount_term']) for i in approved],
+                [int(records[i]['credit_score']) for i in approved]
+            )
+        terms_by_row = {i: {k: float(v[j]) for k, v in batch_terms.items()} for j, i in enumerate(approved.tolist())}
+        with timer.stage('rules'):
+            reason_codes = REJECTION_RULES.evaluate_records(records)
+        explain = wants_explanations()
+        if explain:
+            with timer.stage('shap'):
+                shap_values = current.explainer.shap_values(input_df.to_numpy())
+        
+        results = []
+        for i, (data, row) in enumerate(zip(records, input_df.itertuples(index=False))):
+            response = build_response(data, labels[i], terms_by_row.get(i), rejection_reasons(reason_codes[i]))
+            # Same meaning as score_csv.py's column, whatever the decision
+            response['approval_probability'] = round(float(proba[i, current.approved_index]), 4)
+            if explain:
+                response['shap_reasons'] = top_k_reasons(shap_values[i], list(row), model_features)
+            results.append(response)
+        return jsonify({'results': results})
+        
     except Exception as e:
-        print("Error occurred:", str(e))
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error occurred: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/explain', methods=['POST'])
+def explain():
+    # Follow-up endpoint for clients that scored with explanations turned off
+    data = request.get_json()
+    current = bundle
+    try:
+        encoded = encode_input(data, current)
+    except (KeyError, UnknownCategoryError) as e:
+        return jsonify({'error': f'Invalid application: {e}'}), 400
+    input_df = pd.DataFrame([encoded], columns=model_features)
+    return jsonify({'shap_reasons': get_shap_reasons(input_df, current)})
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    # Reloads this worker only; set MODEL_RELOAD_INTERVAL to reload every worker.
+    # Each reload re-reads and hashes the model, so it is disabled without a token
+    token = os.environ.get('RELOAD_TOKEN')
+    if not token:
+        return jsonify({'error': 'reload endpoint disabled: set RELOAD_TOKEN'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Reload-Token', ''), token):
+        return jsonify({'error': 'forbidden'}), 403
+    previous = bundle.version
+    try:
+        reloaded = reload_model()
+    except Exception as e:
+        model_reloads.inc('error')
+        logger.exception("Model reload failed: %s", e)
+        return jsonify({'error': f'Reload failed: {e}', 'model_version': bundle.version}), 500
+    model_reloads.inc('success' if reloaded else 'unchanged')
+    return jsonify({'reloaded': reloaded, 'previous_version': previous, 'model_version': bundle.version, 'pid': os.getpid()})
+
+@app.route('/health', methods=['GET'])
+def health():
+    # Liveness: the worker process is up and answering
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    # Readiness: the current bundle can score a row and, with PRELOAD_EXPLAINER=1,
+    # the explainer is loaded; otherwise the sklearn model and explainer load on first use
+    current = bundle
+    try:
+        current.self_test()
+    except Exception as e:
+        logger.exception("Readiness self-test failed: %s", e)
+        return jsonify({'status': 'error', 'error': str(e), 'model_version': current.version}), 503
+    if PRELOAD_EXPLAINER and not current.explainer.loaded:
+        return jsonify({'status': 'loading', 'model_version': current.version}), 503
+    return jsonify({
+        'status': 'ready',
+        'pid': os.getpid(),
+        'model_version': current.version,
+        'n_trees': current.forest.n_trees,
+        'n_features': len(model_features),
+        'sklearn_model_loaded': current.model is not None,
+        'explainer_loaded': current.explainer.loaded
+    })
+
+@app.route('/batching/stats', methods=['GET'])
+def batching_stats():
+    if batcher is None:
+        return jsonify({'enabled': False})
+    return jsonify({
+        'enabled': True,
+        'max_wait_ms': batcher.max_wait * 1000,
+        'max_batch_size': batcher.max_batch_size,
+        **batcher.stats.snapshot()
+    })
+
+metrics.callback('loan_api_shap_cache_hits_total', 'SHAP cache hits', lambda: bundle.explainer.cache.hits, 'counter')
+metrics.callback('loan_api_shap_cache_misses_total', 'SHAP cache misses', lambda: bundle.explainer.cache.misses, 'counter')
+metrics.callback('loan_api_shap_cache_entries', 'SHAP vectors currently cached', lambda: len(bundle.explainer.cache))
+if decision_cache is not None:
+    metrics.callback('loan_api_decision_cache_hits_total', 'Decision cache hits (local or shared)', lambda: decision_cache.hits, 'counter')
+    metrics.callback('loan_api_decision_cache_shared_hits_total', 'Decision cache hits served from the shared store', lambda: decision_cache.shared_hits, 'counter')
+    metrics.callback('loan_api_decision_cache_misses_total', 'Decision cache misses', lambda: decision_cache.misses, 'counter')
+    metrics.callback('loan_api_decision_cache_evictions_total', 'Decisions evicted from the in-process LRU', lambda: decision_cache.evictions, 'counter')
+    metrics.callback('loan_api_decision_cache_store_errors_total', 'Failed shared-store reads and writes', lambda: decision_cache.store_errors, 'counter')
+    metrics.callback('loan_api_decision_cache_entries', 'Decisions cached in this process', lambda: len(decision_cache))
+if batcher is not None:
+    metrics.callback('loan_api_microbatch_batches_total', 'Micro-batches scored', lambda: batcher.stats.batches, 'counter')
+    metrics.callback('loan_api_microbatch_requests_total', 'Requests scored through micro-batches', lambda: batcher.stats.requests, 'counter')
+    metrics.callback('loan_api_microbatch_queue_delay_seconds_sum', 'Total time requests waited for a batch', lambda: batcher.stats.queue_delay_sum, 'counter')
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    # Per-process metrics; scrape every worker or run one worker per target
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from forest_engine import FlatForest  # noqa: E402
+from label_lookup import CompiledEncoders  # noqa: E402
+
+
+def load_encoded_dataset():
+    df = pd.read_csv(os.path.join(ROOT, 'professional_loan_dataset.csv')).drop(columns='loan_status')
+    encoders = CompiledEncoders(joblib.load(os.path.join(ROOT, 'professional_label_encoders.pkl')))
+    columns = encoders.encode_columns(df.to_dict('records'), list(df.columns))
+    return pd.DataFrame(columns, columns=df.columns)
+
+
+def latency_us(fn, rows, repeats):
+    timings = []
+    for i in range(repeats):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(row)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main(repeats=500):
+    model = joblib.load(os.path.join(ROOT, 'professional_loan_model.pkl'))
+    forest = FlatForest.from_sklearn(model)
+    X = load_encoded_dataset()
+    X_np = X.to_numpy()
+
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X_np)
+    print(f'Exact match with predict_proba on {len(X)} rows: {np.array_equal(expected, actual)}')
+
+    df_rows = [X.iloc[[i]] for i in range(min(len(X), repeats))]
+    np_rows = [X_np[i:i + 1] for i in range(min(len(X), repeats))]
+    p50, p99 = latency_us(model.predict_proba, df_rows, repeats)
+    print(f'sklearn single row: p50 {p50:.0f} us, p99 {p99:.0f} us')
+    p50, p99 = latency_us(forest.predict_proba, np_rows, repeats)
+    print(f'flat forest single row: p50 {p50:.0f} us, p99 {p99:.0f} us')
+
+    start = time.perf_counter()
+    model.predict_proba(X)
+    print(f'sklearn full dataset: {time.perf_counter() - start:.3f} s')
+    start = time.perf_counter()
+    forest.predict_proba(X_np)
+    print(f'flat forest full dataset: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
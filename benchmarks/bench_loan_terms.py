@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from loan_terms import amortization_schedule, loan_terms, what_if_grid
+
+
+def calculate_loan_terms(loan_amount, loan_amount_term, credit_score):
+    # The original if/elif version of calculate_loan_terms, kept as an
+    # independent reference for the vectorized results
+    if credit_score >= 800:
+        interest_rate = 7.0
+    elif credit_score >= 750:
+        interest_rate = 8.0
+    elif credit_score >= 700:
+        interest_rate = 9.0
+    elif credit_score >= 650:
+        interest_rate = 10.5
+    else:
+        interest_rate = 13.0
+    P = loan_amount * 1000
+    N = loan_amount_term
+    R = interest_rate / (12 * 100)
+    EMI = (P * R * (1 + R) ** N) / ((1 + R) ** N - 1) if R > 0 else P / N
+    total_payment = EMI * N
+    return {
+        'interest_rate': round(interest_rate, 2),
+        'emi': round(EMI, 2),
+        'total_payment': round(total_payment, 2)
+    }
+
+
+def main(n=1_000_000):
+    rng = np.random.default_rng(42)
+    amounts = rng.integers(50, 800, n).astype(float)
+    terms = rng.choice([180, 240, 300, 360, 480], n)
+    scores = rng.integers(300, 900, n)
+
+    start = time.perf_counter()
+    vectorized = loan_terms(amounts, terms, scores)
+    vec_time = time.perf_counter() - start
+    print(f'vectorized: {n:,} loans in {vec_time:.3f} s')
+
+    start = time.perf_counter()
+    scalar = [calculate_loan_terms(a, int(t), int(s)) for a, t, s in zip(amounts.tolist(), terms.tolist(), scores.tolist())]
+    scalar_time = time.perf_counter() - start
+    print(f'scalar loop: {n:,} loans in {scalar_time:.3f} s ({scalar_time / vec_time:.0f}x slower)')
+
+    for key in ('interest_rate', 'emi', 'total_payment'):
+        expected = np.array([row[key] for row in scalar])
+        mismatches = int((expected != vectorized[key]).sum())
+        print(f'{key}: {mismatches} mismatches')
+
+    start = time.perf_counter()
+    grid = what_if_grid(np.arange(50, 800, 10), [180, 240, 300, 360, 480], 720)
+    print(f'what-if grid {grid["emi"].shape}: {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    start = time.perf_counter()
+    schedule = amortization_schedule(amounts[:10_000], terms[:10_000], scores[:10_000])
+    print(f'amortization schedules for 10,000 loans {schedule["balance"].shape}: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
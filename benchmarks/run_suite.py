@@ -0,0 +1,175 @@
+"""End-to-end performance suite for the loan API.
+
+Micro-benchmarks the scoring building blocks, then drives the Flask app with
+concurrent clients (in-process test client, or a running server with
+--url) and prints one JSON document that can be diffed across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import app  # noqa: E402
+from instrumentation import peak_rss_mb  # noqa: E402
+
+
+def summarize(timings, wall=None):
+    timings = np.asarray(timings) * 1e6
+    result = {
+        'n': int(len(timings)),
+        'p50_us': round(float(np.percentile(timings, 50)), 1),
+        'p95_us': round(float(np.percentile(timings, 95)), 1),
+        'p99_us': round(float(np.percentile(timings, 99)), 1),
+        'mean_us': round(float(timings.mean()), 1),
+    }
+    total = wall if wall is not None else timings.sum() / 1e6
+    result['throughput_per_s'] = round(len(timings) / total, 1) if total else None
+    return result
+
+
+def time_calls(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def micro_benchmarks(records, iterations):
+    sample = records[:iterations]
+    encoded = [app.encode_input(r) for r in sample]
+    frames = [pd.DataFrame([e], columns=app.model_features) for e in encoded]
+    arrays = [f.to_numpy() for f in frames]
+    model = app.get_model()
+    app.bundle.explainer.load()
+
+    def shap_cold(frame):
+        app.bundle.explainer.cache.clear()
+        app.get_shap_reasons(frame)
+
+    results = {
+        'encode_input': time_calls(app.encode_input, [(r,) for r in sample]),
+        'model.predict': time_calls(model.predict, [(f,) for f in frames]),
+        'flat_forest.predict': time_calls(app.bundle.forest.predict, [(a,) for a in arrays]),
+        'get_shap_reasons_cold': time_calls(shap_cold, [(f,) for f in frames]),
+    }
+    # Fill the SHAP cache so the next pass measures hits only
+    for frame in frames:
+        app.get_shap_reasons(frame)
+    results.update({
+        'get_shap_reasons_cached': time_calls(app.get_shap_reasons, [(f,) for f in frames]),
+        'calculate_loan_terms': time_calls(app.calculate_loan_terms, [
+            (float(r['loan_amount']), int(r['loan_amount_term']), int(r['credit_score'])) for r in sample
+        ]),
+        'explain_rejection': time_calls(app.explain_rejection, [(r,) for r in sample]),
+    })
+    app.bundle.explainer.cache.clear()
+    return results
+
+
+def make_poster(url):
+    if url is None:
+        local = threading.local()
+
+        def post(path, payload):
+            # One test client per load thread
+            if not hasattr(local, 'client'):
+                local.client = app.app.test_client()
+            return local.client.post(path, json=payload).status_code
+        return post
+
+    def post(path, payload):
+        req = urllib.request.Request(url.rstrip('/') + path, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req) as resp:
+            resp.read()
+            return resp.status
+    return post
+
+
+def load_test(post, path, payloads, concurrency):
+    timings = [None] * len(payloads)
+    statuses = [None] * len(payloads)
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            statuses[i] = post(path, payloads[i])
+        except Exception:
+            statuses[i] = None
+        timings[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(len(payloads))))
+    wall = time.perf_counter() - start
+    result = summarize(timings, wall)
+    result['errors'] = sum(status != 200 for status in statuses)
+    result['concurrency'] = concurrency
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dataset', default='professional_loan_dataset.csv')
+    parser.add_argument('--iterations', type=int, default=200, help='Calls per micro-benchmark')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per load scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--url', help='Load-test a running server instead of the in-process app')
+    parser.add_argument('--output', help='Write the JSON report here as well as to stdout')
+    args = parser.parse_args()
+
+    records = pd.read_csv(args.dataset).drop(columns='loan_status').to_dict('records')
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'dataset': args.dataset,
+        'micro': micro_benchmarks(records, args.iterations),
+    }
+
+    post = make_poster(args.url)
+    singles = records[:args.requests]
+    batches = [records[i:i + args.batch_size] for i in range(0, len(records), args.batch_size)][:max(1, args.requests // args.batch_size)]
+    report['load'] = {
+        'target': args.url or 'in-process',
+        '/predict?explain=0': load_test(post, '/predict?explain=0', singles, args.concurrency),
+        '/predict': load_test(post, '/predict', singles, args.concurrency),
+        f'/predict/batch?explain=0 ({args.batch_size} rows)': load_test(post, '/predict/batch?explain=0', batches, args.concurrency),
+    }
+    report['peak_rss_mb'] = peak_rss_mb()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SqliteStore:
+    """Decision store on local disk, shared by every worker on the host."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)')
+        conn.commit()
+
+    def _conn(self):
+        # One connection per thread and per process (connections do not survive fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, now):
+        """``(value, expires)`` for a live entry, else None; ``expires`` is wall-clock time."""
+        row = self._conn().execute('SELECT value, expires FROM decisions WHERE key = ?', (key,)).fetchone()
+        if row is None or row[1] < now:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, value, expires):
+        self._conn().execute('INSERT OR REPLACE INTO decisions (key, value, expires) VALUES (?, ?, ?)',
+                             (key, json.dumps(value), expires))
+
+    def purge(self, now, keep_prefix=None):
+        conn = self._conn()
+        conn.execute('DELETE FROM decisions WHERE expires < ?', (now,))
+        if keep_prefix is not None:
+            conn.execute('DELETE FROM decisions WHERE substr(key, 1, ?) != ?', (len(keep_prefix), keep_prefix))
+
+
+class DecisionCache:
+    """Bounded LRU + TTL cache of /predict responses keyed on the encoded features.
+
+    Entries are namespaced by the ``model_version`` (the model artifact's
+    hash) of the bundle that encoded the request, passed to every ``get`` and
+    ``put``. Calling ``set_model_version`` with a new hash drops everything
+    cached for the old model, and later puts for the old model are ignored. An optional shared ``store`` backs the in-process LRU so
+    workers can reuse each other's decisions.
+    """
+
+    # Expired rows are swept from the shared store every this many writes
+    PURGE_EVERY = 1000
+
+    def __init__(self, maxsize=10000, ttl=3600.0, model_version='', store=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_version = model_version
+        self.store = store
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_errors = 0
+        self._puts = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def make_key(model_version, features, explain):
+        # JSON keeps 150 and 150.0 apart: they render differently in SHAP reasons
+        return json.dumps([model_version, bool(explain), list(features)], separators=(',', ':'), default=str)
+
+    def set_model_version(self, model_version):
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            self.model_version = model_version
+            self._data.clear()
+        if self.store is not None:
+            self._store_call(self.store.purge, time.time(), keep_prefix=json.dumps([model_version])[:-1])
+
+    def get(self, model_version, features, explain):
+        key = self.make_key(model_version, features, explain)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] >= now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+        if self.store is not None:
+            now = time.time()
+            stored = self._store_call(self.store.get, key, now)
+            if stored is not None:
+                value, expires = stored
+                # Only for what is left of the shared entry's lifetime
+                self._put_local(key, value, expires - now)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model_version, features, explain, value):
+        # A request scored by a model swapped out meanwhile is not worth keeping
+        if model_version != self.model_version:
+            return
+        key = self.make_key(model_version, features, explain)
+        self._put_local(key, value, self.ttl)
+        if self.store is not None:
+            now = time.time()
+            self._store_call(self.store.put, key, value, now + self.ttl)
+            self._puts += 1
+            if self._puts % self.PURGE_EVERY == 0:
+                self._store_call(self.store.purge, now)
+
+    def _store_call(self, method, *args, **kwargs):
+        # A busy or broken shared store degrades to the in-process cache
+        try:
+            return method(*args, **kwargs)
+        except sqlite3.Error:
+            with self._lock:
+                self.store_errors += 1
+            return None
+
+    def _put_local(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def class_shap(shap_values, class_index):
+    # Normalise shap output to a (n_samples, n_features) array for one class,
+    # indexed like model.classes_. Older shap returns one array per class,
+    # newer returns (n, features, classes).
+    if isinstance(shap_values, list):
+        return np.asarray(shap_values[class_index], dtype=float)
+    shap_values = np.asarray(shap_values, dtype=float)
+    if shap_values.ndim == 3:
+        return shap_values[:, :, class_index]
+    # A single output is the log-odds of classes_[1]; the other class is its mirror
+    return shap_values if class_index == 1 else -shap_values
+
+
+def top_k_indices(shap_vals, k=3):
+    """Indices of the k largest |shap| values, largest first, without a full sort."""
+    magnitude = np.abs(np.asarray(shap_vals, dtype=float))
+    k = min(k, len(magnitude))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    # argpartition finds the k-th largest magnitude; keep everything tied with it
+    # so ties resolve by feature position, like a stable sort would
+    kth = magnitude[np.argpartition(-magnitude, k - 1)[k - 1]]
+    candidates = np.flatnonzero(magnitude >= kth)
+    return candidates[np.lexsort((candidates, -magnitude[candidates]))][:k]
+
+
+def top_k_reasons(shap_vals, values, features, k=3):
+    explanations = []
+    for i in top_k_indices(shap_vals, k):
+        direction = 'increased' if shap_vals[i] > 0 else 'decreased'
+        explanations.append(f"{features[i]} ({values[i]}) {direction} the approval probability")
+    return explanations
+
+
+class ShapCache:
+    """Thread-safe LRU of per-class SHAP vectors keyed on encoded rows."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CachedExplainer:
+    """Wraps a shap.TreeExplainer so each distinct encoded row is explained once.
+
+    Rows already in the cache are served from it; the remaining distinct rows
+    go through the explainer in a single pass. Pass ``factory`` instead of an
+    explainer to defer building it (and importing shap) until first needed.
+    ``class_index`` is the column of ``model.classes_`` to explain: the one
+    whose probability the reasons talk about.
+    """
+
+    def __init__(self, explainer=None, cache_size=4096, factory=None, *, class_index):
+        if explainer is None and factory is None:
+            raise ValueError('CachedExplainer needs an explainer or a factory')
+        self._explainer = explainer
+        self._factory = factory
+        self._load_lock = threading.Lock()
+        self.class_index = class_index
+        self.cache = ShapCache(cache_size)
+
+    @property
+    def loaded(self):
+        return self._explainer is not None
+
+    @property
+    def explainer(self):
+        return self.load()
+
+    def load(self):
+        if self._explainer is None:
+            with self._load_lock:
+                if self._explainer is None:
+                    self._explainer = self._factory()
+        return self._explainer
+
+    def shap_values(self, X):
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        keys = [tuple(row) for row in X.tolist()]
+        out = np.empty(X.shape, dtype=float)
+        pending = {}
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                out[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+        if pending:
+            first_rows = [rows[0] for rows in pending.values()]
+            computed = class_shap(self.explainer.shap_values(X[first_rows]), self.class_index)
+            for (key, rows), values in zip(pending.items(), computed):
+                values = values.copy()
+                values.setflags(write=False)
+                self.cache.put(key, values)
+                out[rows] = values
+        return out
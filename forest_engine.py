@@ -0,0 +1,117 @@
+import json
+import os
+
+import numpy as np
+
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'children', 'value', 'roots', 'classes')
+
+
+class FlatForest:
+    """A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    All trees share one set of arrays; ``roots`` holds the offset of each tree.
+    Leaves point to themselves so traversal can run a fixed number of steps
+    without masking, and leaf ``value`` rows are already normalised to class
+    probabilities the same way sklearn does it.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes = classes
+        # Interleaved (right, left) pairs so one take() picks the next node
+        self.children = np.stack([right, left], axis=1).ravel() if children is None else children
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for est in model.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            ids = np.arange(n, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+            left = np.where(is_leaf, ids, tree.children_left + offset).astype(np.int32)
+            right = np.where(is_leaf, ids, tree.children_right + offset).astype(np.int32)
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+            value = tree.value[:, 0, :].astype(np.float64)
+            value = value / value.sum(axis=1, keepdims=True)
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(lefts),
+            np.concatenate(rights),
+            np.concatenate(values),
+            np.asarray(roots, dtype=np.int32),
+            max_depth,
+            np.asarray(model.classes_),
+        )
+
+    def save_dir(self, path, **meta):
+        """Write each array as a raw .npy file so it can be memory-mapped back."""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(path, 'forest.json'), 'w') as f:
+            json.dump({'max_depth': self.max_depth, **meta}, f)
+
+    @classmethod
+    def load_dir(cls, path, mmap=True):
+        mode = 'r' if mmap else None
+        # np.asarray drops the np.memmap subclass (same pages, no copy); its
+        # per-operation overhead more than doubles single-row latency
+        arrays = {name: np.asarray(np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)) for name in _ARRAYS}
+        with open(os.path.join(path, 'forest.json')) as f:
+            meta = json.load(f)
+        return cls(max_depth=meta['max_depth'], **arrays)
+
+    def apply(self, X):
+        """Return the leaf index reached in every tree, shape (n_trees, n_samples)."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        n_samples, n_features = X.shape
+        flat_X = X.ravel()
+        row_offset = (np.arange(n_samples, dtype=np.int64) * n_features)[None, :]
+        node = np.repeat(self.roots[:, None], n_samples, axis=1)
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offset + self.feature.take(node))
+            go_left = x <= self.threshold.take(node)
+            node = self.children.take(2 * node + go_left)
+        return node
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        proba = np.zeros((leaves.shape[1], self.value.shape[1]))
+        # Accumulate tree by tree, in order, to reproduce sklearn's rounding
+        for tree_leaves in leaves:
+            proba += self.value[tree_leaves]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
@@ -1,40 +1,152 @@
-import pandas as pd
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-np.random.seed(42)
-
-n = 20000
-
-data = {
-    'age': np.random.randint(21, 65, n),
-    'gender': np.random.choice(['Male', 'Female'], n),
-    'married': np.random.choice(['Yes', 'No'], n),
-    'dependents': np.random.randint(0, 4, n),
-    'education': np.random.choice(['Graduate', 'Not Graduate'], n),
-    'employment_type': np.random.choice(['Salaried', 'Self-Employed', 'Business', 'Unemployed'], n),
-    'years_at_job': np.random.randint(0, 30, n),
-    'annual_income': np.random.randint(100, 2000, n),
-    'coapplicant_income': np.random.randint(0, 1000, n),
-    'credit_score': np.random.randint(300, 900, n),
-    'credit_history': np.random.choice(['Good', 'Bad'], n, p=[0.8, 0.2]),
-    'loan_amount': np.random.randint(50, 800, n),
-    'loan_amount_term': np.random.choice([180, 240, 300, 360, 480], n),
-    'loan_purpose': np.random.choice(['Home', 'Car', 'Education', 'Personal', 'Business', 'Other'], n),
-    'property_area': np.random.choice(['Rural', 'Semiurban', 'Urban'], n),
-    'collateral_value': np.random.randint(0, 1000, n),
+import pandas as pd
+
+from rules import APPROVAL_RULES
+from sinks import open_sink
+
+# Distribution knobs drift scenarios move away from
+BASE_PARAMS = {
+    'credit_score_shift': 0,
+    'income_scale': 1.0,
+    'loan_amount_scale': 1.0,
+    'bad_history_p': 0.2,
+    # None draws employment types uniformly, as the original generator did
+    'employment_p': None,
+}
+
+EMPLOYMENT_TYPES = ['Salaried', 'Self-Employed', 'Business', 'Unemployed']
+
+DRIFT_SCENARIOS = {
+    'none': {},
+    'credit_score_shift': {'credit_score_shift': -60},
+    'income_shift': {'income_scale': 1.3},
+    'loan_inflation': {'loan_amount_scale': 1.4},
+    'recession': {
+        'credit_score_shift': -40,
+        'income_scale': 0.8,
+        'bad_history_p': 0.35,
+        # Same order as EMPLOYMENT_TYPES
+        'employment_p': [0.3, 0.2, 0.2, 0.3],
+    },
 }
 
-df = pd.DataFrame(data)
-
-# Simulate loan_status with a simple rule-based logic for demo
-conditions = (
-    (df['credit_score'] >= 650) &
-    (df['credit_history'] == 'Good') &
-    (df['annual_income'] > 200) &
-    (df['loan_amount'] < df['annual_income'] * 0.6) &
-    (df['years_at_job'] >= 2) &
-    (df['collateral_value'] >= df['loan_amount'] * 0.5)
-)
-df['loan_status'] = np.where(conditions, 'Approved', 'Rejected')
-
-df.to_csv('professional_loan_dataset.csv', index=False)
-print('Synthetic professional dataset saved as professional_loan_dataset.csv') 
\ No newline at end of file
+
+def drift_params(scenario, strength=1.0):
+    """BASE_PARAMS moved towards a scenario; strength 0 is no drift, 1 the full scenario."""
+    params = dict(BASE_PARAMS)
+    if strength <= 0:
+        return params
+    for key, target in DRIFT_SCENARIOS[scenario].items():
+        if key == 'employment_p':
+            uniform = np.full(len(target), 1 / len(target))
+            params[key] = list(uniform + strength * (np.asarray(target) - uniform))
+        else:
+            params[key] = params[key] + strength * (target - params[key])
+    return params
+
+
+def generate_chunk(rng, n, params=BASE_PARAMS):
+    """One chunk of applications from a RandomState-compatible ``rng``.
+
+    With BASE_PARAMS the draws happen in the same order as the original
+    generator, so ``np.random.RandomState(42)`` and n=20000 reproduce
+    professional_loan_dataset.csv exactly.
+    """
+    data = {}
+    data['age'] = rng.randint(21, 65, n)
+    data['gender'] = rng.choice(['Male', 'Female'], n)
+    data['married'] = rng.choice(['Yes', 'No'], n)
+    data['dependents'] = rng.randint(0, 4, n)
+    data['education'] = rng.choice(['Graduate', 'Not Graduate'], n)
+    data['employment_type'] = rng.choice(EMPLOYMENT_TYPES, n, p=params['employment_p'])
+    data['years_at_job'] = rng.randint(0, 30, n)
+    data['annual_income'] = rng.randint(100, 2000, n)
+    data['coapplicant_income'] = rng.randint(0, 1000, n)
+    data['credit_score'] = rng.randint(300, 900, n)
+    bad = params['bad_history_p']
+    data['credit_history'] = rng.choice(['Good', 'Bad'], n, p=[1 - bad, bad])
+    data['loan_amount'] = rng.randint(50, 800, n)
+    data['loan_amount_term'] = rng.choice([180, 240, 300, 360, 480], n)
+    data['loan_purpose'] = rng.choice(['Home', 'Car', 'Education', 'Personal', 'Business', 'Other'], n)
+    data['property_area'] = rng.choice(['Rural', 'Semiurban', 'Urban'], n)
+    data['collateral_value'] = rng.randint(0, 1000, n)
+
+    # Drift is applied after drawing so the random sequence stays the same
+    if params['credit_score_shift']:
+        data['credit_score'] = np.clip(data['credit_score'] + round(params['credit_score_shift']), 300, 899)
+    if params['income_scale'] != 1.0:
+        data['annual_income'] = np.maximum((data['annual_income'] * params['income_scale']).round().astype(np.int64), 1)
+    if params['loan_amount_scale'] != 1.0:
+        data['loan_amount'] = (data['loan_amount'] * params['loan_amount_scale']).round().astype(np.int64)
+
+    df = pd.DataFrame(data)
+
+    # Simulate loan_status with a simple rule-based logic for demo
+    df['loan_status'] = np.where(APPROVAL_RULES.evaluate(data) == 0, 'Approved', 'Rejected')
+    return df
+
+
+def chunk_rng(seed, index, n_chunks):
+    if n_chunks == 1:
+        # Original single-stream seeding, kept so the shipped dataset reproduces
+        return np.random.RandomState(seed)
+    # Independent, reproducible stream per chunk, whatever the worker count
+    return np.random.RandomState(np.random.MT19937(np.random.SeedSequence(seed, spawn_key=(index,))))
+
+
+def build_chunk(seed, index, n_chunks, n, scenario, strength):
+    return generate_chunk(chunk_rng(seed, index, n_chunks), n, drift_params(scenario, strength))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic loan applications in reproducible, streamed chunks.')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--output', default='professional_loan_dataset.csv', help='.csv or .parquet')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--drift', choices=sorted(DRIFT_SCENARIOS), default='none')
+    parser.add_argument('--drift-strength', type=float, default=1.0)
+    parser.add_argument('--drift-ramp', action='store_true',
+                        help='Grow the drift linearly from 0 to --drift-strength across the chunks')
+    args = parser.parse_args()
+
+    n_chunks = max(1, -(-args.rows // args.chunk_rows))
+    sink = open_sink(args.output)
+    start = time.perf_counter()
+    written = 0
+    pending = deque()
+
+    def drain_one():
+        nonlocal written
+        frame = pending.popleft().result()
+        sink.write(frame)
+        written += len(frame)
+        if n_chunks > 1:
+            print(f'{written} rows written, {written / (time.perf_counter() - start):,.0f} rows/sec', file=sys.stderr)
+
+    with ProcessPoolExecutor(min(args.workers, n_chunks)) as pool:
+        for index in range(n_chunks):
+            n = min(args.chunk_rows, args.rows - index * args.chunk_rows)
+            # The ramp runs from no drift in the first chunk to full strength in the last
+            strength = args.drift_strength * (index / max(n_chunks - 1, 1) if args.drift_ramp else 1.0)
+            pending.append(pool.submit(build_chunk, args.seed, index, n_chunks, n, args.drift, strength))
+            # Bounded number of chunks in memory at any time
+            if len(pending) >= 2 * args.workers:
+                drain_one()
+        while pending:
+            drain_one()
+    sink.close()
+
+    print(f'Synthetic professional dataset saved as {args.output} ({written} rows)')
+
+
+if __name__ == '__main__':
+    main()
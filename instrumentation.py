@@ -0,0 +1,232 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label combination."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted(self._series.items())
+            for label_values, (counts, total, count) in items:
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    labels = _format_labels(self.label_names, label_values, ('le', repr(bound)))
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.label_names, label_values, ('le', '+Inf'))
+                lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}')
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from ``fn()`` at scrape time.
+
+    ``fn`` returns a number, or a dict mapping label value to number.
+    """
+
+    def __init__(self, name, help_text, fn, metric_type='gauge', label_name=None):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn
+        self.metric_type = metric_type
+        self.label_name = label_name
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.metric_type}']
+        value = self.fn()
+        if isinstance(value, dict):
+            for label_value, v in sorted(value.items()):
+                lines.append(f'{self.name}{{{self.label_name}="{label_value}"}} {_format_value(v)}')
+        elif value is not None:
+            lines.append(f'{self.name} {_format_value(value)}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register(Counter(name, help_text, label_names))
+
+    def callback(self, name, help_text, fn, metric_type='gauge', label_name=None):
+        return self.register(CallbackMetric(name, help_text, fn, metric_type, label_name))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    """Times named stages of a request into one histogram labelled by stage."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram.observe(time.perf_counter() - start, name)
+
+
+class SamplingFilter(logging.Filter):
+    """Passes only a fraction of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, sample_rate):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+
+class _QueueLogging:
+    """Queue handler in front of a stream handler, written from a background thread."""
+
+    def __init__(self, target):
+        self.target = target
+        self.queue = queue.SimpleQueue()
+        self.handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = None
+        self.start()
+
+    def start(self):
+        self.listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self):
+        # The listener thread does not survive fork(); the child needs its own
+        self.queue = queue.SimpleQueue()
+        self.handler.queue = self.queue
+        self.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+_queue_logging = None
+
+
+def configure_logging(name, level=None, sample_rate=None):
+    """Return a logger whose records are sampled and written off the request thread.
+
+    ``level`` and ``sample_rate`` default to the LOG_LEVEL and LOG_SAMPLE_RATE
+    environment variables (INFO and 1.0).
+    """
+    global _queue_logging
+    level = level or os.environ.get('LOG_LEVEL', 'INFO')
+    if sample_rate is None:
+        sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    if _queue_logging is None:
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter('%(asctime)s %(process)d %(levelname)s %(name)s: %(message)s'))
+        _queue_logging = _QueueLogging(stream)
+        atexit.register(_queue_logging.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_queue_logging.restart_after_fork)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.filters = [f for f in logger.filters if not isinstance(f, SamplingFilter)]
+    logger.addFilter(SamplingFilter(sample_rate))
+    logger.addHandler(_queue_logging.handler)
+    return logger
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class UnknownCategoryError(ValueError):
+    """Raised when a value was never seen by the fitted LabelEncoder."""
+
+    def __init__(self, field, value, known, row=None):
+        self.field = field
+        self.value = value
+        self.known = list(known)
+        self.row = row
+        where = f"row {row}: " if row is not None else ""
+        super().__init__(
+            f"{where}unknown value {value!r} for '{field}' (expected one of {self.known})"
+        )
+
+
+class LabelLookup:
+    """Plain dict/array view of one fitted LabelEncoder.
+
+    Codes are positions in ``classes_``, exactly what ``LabelEncoder.transform``
+    returns, without its per-call validation overhead.
+    """
+
+    def __init__(self, field, classes):
+        self.field = field
+        self.classes = np.asarray(classes, dtype=object)
+        self.index = {c: i for i, c in enumerate(self.classes.tolist())}
+        # Sorted view for vectorized lookups; also works if classes were
+        # appended out of order after fitting.
+        self._order = np.argsort(self.classes.astype(str), kind='stable')
+        self._sorted = self.classes.astype(str)[self._order]
+
+    def encode(self, value):
+        try:
+            return self.index[value]
+        except (KeyError, TypeError):
+            raise UnknownCategoryError(self.field, value, self.classes.tolist()) from None
+
+    def encode_column(self, values):
+        values = np.asarray(values, dtype=object)
+        as_str = values.astype(str)
+        pos = np.searchsorted(self._sorted, as_str)
+        pos[pos == len(self._sorted)] = 0
+        known = self._sorted[pos] == as_str
+        if not known.all():
+            row = int(np.flatnonzero(~known)[0])
+            raise UnknownCategoryError(self.field, values[row], self.classes.tolist(), row=row)
+        return self._order[pos].astype(np.int64)
+
+    def decode(self, codes):
+        return self.classes[np.asarray(codes, dtype=np.int64)]
+
+
+class CompiledEncoders:
+    """Lookup tables compiled once from the pickled ``le_dict``."""
+
+    def __init__(self, le_dict):
+        self.lookups = {f: LabelLookup(f, le.classes_) for f, le in le_dict.items()}
+
+    @classmethod
+    def from_classes(cls, classes_by_field):
+        """Build from plain ``{field: [classes...]}``, e.g. loaded from JSON."""
+        self = cls.__new__(cls)
+        self.lookups = {f: LabelLookup(f, classes) for f, classes in classes_by_field.items()}
+        return self
+
+    def classes(self):
+        return {f: lookup.classes.tolist() for f, lookup in self.lookups.items()}
+
+    def __contains__(self, field):
+        return field in self.lookups
+
+    def __getitem__(self, field):
+        return self.lookups[field]
+
+    def encode_record(self, data, features):
+        encoded = {}
+        for f in features:
+            if f in self.lookups:
+                encoded[f] = self.lookups[f].encode(data[f])
+            else:
+                encoded[f] = data[f]
+        return encoded
+
+    def encode_columns(self, records, features):
+        columns = {}
+        for f in features:
+            values = [r[f] for r in records]
+            if f in self.lookups:
+                columns[f] = self.lookups[f].encode_column(values)
+            else:
+                columns[f] = values
+        return columns
+
+    def decode(self, field, codes):
+        return self.lookups[field].decode(codes)
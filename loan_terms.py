@@ -0,0 +1,149 @@
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+
+class RateTable:
+    """Interest-rate tiers by credit score, looked up with ``searchsorted``.
+
+    ``tiers`` is a sequence of (minimum_score, rate) pairs; scores below the
+    lowest tier get ``base_rate``.
+    """
+
+    def __init__(self, tiers, base_rate):
+        tiers = sorted(tiers)
+        self.thresholds = np.array([score for score, _ in tiers], dtype=float)
+        self.rates = np.array([base_rate] + [rate for _, rate in tiers], dtype=float)
+        # Plain-Python copies for single lookups, where NumPy call overhead dominates
+        self._threshold_list = self.thresholds.tolist()
+        self._rate_list = self.rates.tolist()
+
+    def tier(self, credit_scores):
+        return np.searchsorted(self.thresholds, credit_scores, side='right')
+
+    def lookup(self, credit_scores):
+        return self.rates[self.tier(credit_scores)]
+
+    def rate(self, credit_score):
+        """Scalar ``lookup`` for one score, as a Python float."""
+        return self._rate_list[bisect_right(self._threshold_list, credit_score)]
+
+
+# The tiers both /predict and /predict/batch quote
+DEFAULT_RATE_TABLE = RateTable([(650, 10.5), (700, 9.0), (750, 8.0), (800, 7.0)], base_rate=13.0)
+
+
+def calculate_loan_terms(loan_amount, loan_amount_term, credit_score, rate_table=DEFAULT_RATE_TABLE):
+    """Interest rate, EMI and total payment for one loan; amounts are in thousands."""
+    interest_rate = rate_table.rate(credit_score)
+    # EMI calculation
+    P = loan_amount * 1000  # convert to actual amount
+    N = loan_amount_term
+    R = interest_rate / (12 * 100)
+    EMI = (P * R * (1 + R) ** N) / ((1 + R) ** N - 1) if R > 0 else P / N
+    total_payment = EMI * N
+    return {
+        'interest_rate': round(interest_rate, 2),
+        'emi': round(EMI, 2),
+        'total_payment': round(total_payment, 2)
+    }
+
+
+@lru_cache(maxsize=4096)
+def _growth(monthly_rate, months):
+    # (1 + R) ** N, shared by every loan with the same rate and term
+    return (1 + monthly_rate) ** months
+
+
+def _round_like_python(values, ndigits=2):
+    """np.round, except near-ties are re-rounded with Python's round().
+
+    np.round scales by 10**ndigits first, which can flip ties that round()
+    resolves on the exact binary value.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, ndigits) for v in values[near_tie].tolist()]
+    return rounded
+
+
+def loan_terms(loan_amounts, loan_amount_terms, credit_scores, rate_table=DEFAULT_RATE_TABLE, rounded=True):
+    """Vectorized calculate_loan_terms over broadcastable arrays.
+
+    Amounts are in thousands, as in the API. Returns a dict of arrays with
+    ``interest_rate``, ``emi`` and ``total_payment``. Values match the
+    scalar function element for element when ``rounded`` is true.
+    """
+    amounts, terms, scores = np.broadcast_arrays(
+        np.asarray(loan_amounts, dtype=float),
+        np.asarray(loan_amount_terms, dtype=np.int64),
+        np.asarray(credit_scores, dtype=float),
+    )
+    tier = rate_table.tier(scores)
+    interest_rate = rate_table.rates[tier]
+    P = amounts * 1000
+    R = interest_rate / (12 * 100)
+
+    # Only a handful of (tier, term) pairs exist in practice: compute the
+    # growth factor once per pair and scatter it back
+    key = tier.astype(np.int64) * (int(terms.max(initial=0)) + 1) + terms
+    _, first, inverse = np.unique(key.ravel(), return_index=True, return_inverse=True)
+    flat_R, flat_terms = R.ravel(), terms.ravel()
+    growth = np.array([_growth(float(flat_R[i]), int(flat_terms[i])) for i in first])
+    growth = growth[inverse.ravel()].reshape(R.shape)
+
+    # A zero term gives inf/NaN rather than warnings; callers validate terms
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        emi = np.where(R > 0, (P * R * growth) / (growth - 1), P / terms)
+        total_payment = emi * terms
+        if rounded:
+            interest_rate = _round_like_python(interest_rate)
+            emi = _round_like_python(emi)
+            total_payment = _round_like_python(total_payment)
+    return {'interest_rate': interest_rate, 'emi': emi, 'total_payment': total_payment}
+
+
+def what_if_grid(loan_amounts, loan_amount_terms, credit_score, rate_table=DEFAULT_RATE_TABLE):
+    """EMI and total payment for every amount x term combination, shape (amounts, terms)."""
+    amounts = np.asarray(loan_amounts, dtype=float)[:, None]
+    terms = np.asarray(loan_amount_terms, dtype=np.int64)[None, :]
+    return loan_terms(amounts, terms, credit_score, rate_table)
+
+
+def amortization_schedule(loan_amounts, loan_amount_terms, credit_scores, rate_table=DEFAULT_RATE_TABLE):
+    """Month-by-month schedules for many loans at once.
+
+    Returns arrays of shape (n_loans, max_term) for ``interest``,
+    ``principal`` and ``balance`` (remaining after each payment). Months
+    past a loan's term are zero. Memory grows with n_loans * max_term, so
+    schedule large portfolios in chunks.
+    """
+    amounts = np.atleast_1d(np.asarray(loan_amounts, dtype=float))
+    terms = np.atleast_1d(np.asarray(loan_amount_terms, dtype=np.int64))
+    scores = np.atleast_1d(np.asarray(credit_scores, dtype=float))
+    amounts, terms, scores = np.broadcast_arrays(amounts, terms, scores)
+
+    emi = loan_terms(amounts, terms, scores, rate_table, rounded=False)['emi'][:, None]
+    P = amounts[:, None] * 1000
+    R = (rate_table.lookup(scores) / (12 * 100))[:, None]
+    months = np.arange(1, int(terms.max()) + 1)[None, :]
+    active = months <= terms[:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + R) ** months
+        balance = np.where(R > 0, P * growth - emi * (growth - 1) / R, P - emi * months)
+    # Closed form leaves float dust at the end; the final payment clears the loan
+    balance = np.where(months >= terms[:, None], 0.0, np.maximum(balance, 0.0))
+    previous = np.concatenate([P, balance[:, :-1]], axis=1)
+    interest = previous * R
+    principal = previous - balance
+    return {
+        'emi': emi[:, 0],
+        'interest': np.where(active, interest, 0.0),
+        'principal': np.where(active, principal, 0.0),
+        'balance': np.where(active, balance, 0.0),
+    }
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchStats:
+    """Counters for coalesced batches: sizes and how long requests queued."""
+
+    def __init__(self, max_batch_size):
+        self.batch_size_counts = [0] * (max_batch_size + 1)
+        self.batches = 0
+        self.requests = 0
+        self.queue_delay_sum = 0.0
+        self.queue_delay_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, size, delays):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.batch_size_counts[size] += 1
+            self.queue_delay_sum += sum(delays)
+            self.queue_delay_max = max(self.queue_delay_max, max(delays))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'batch_size_counts': {
+                    size: count for size, count in enumerate(self.batch_size_counts) if count
+                },
+                'mean_queue_delay_ms': 1000 * self.queue_delay_sum / self.requests if self.requests else 0.0,
+                'max_queue_delay_ms': 1000 * self.queue_delay_max,
+            }
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item calls into batched calls of ``score_fn``.
+
+    Callers block in ``submit`` while an asyncio loop on a background thread
+    collects items for up to ``max_wait_ms`` or ``max_batch_size`` items,
+    scores them with one ``score_fn(items)`` call and hands each caller its
+    own result. ``score_fn`` must return one result per item, in order.
+    """
+
+    def __init__(self, score_fn, max_wait_ms=5.0, max_batch_size=64, timeout=30.0):
+        self.score_fn = score_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self.stats = BatchStats(max_batch_size)
+        self._loop = None
+        self._queue = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Start lazily, and again after a fork: threads do not survive fork()
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            ready = threading.Event()
+            thread = threading.Thread(target=self._run, args=(ready,), name='microbatcher', daemon=True)
+            thread.start()
+            ready.wait()
+            self._pid = os.getpid()
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        # Scoring runs off the loop so the next batch can fill up meanwhile
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='microbatch-score')
+        self._loop.create_task(self._collect())
+        ready.set()
+        self._loop.run_forever()
+
+    async def _enqueue(self, item):
+        future = self._loop.create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._score(batch)
+
+    async def _score(self, batch):
+        items = [item for item, _, _ in batch]
+        started = time.perf_counter()
+        self.stats.record(len(batch), [started - queued for _, _, queued in batch])
+        try:
+            results = await self._loop.run_in_executor(self._executor, self.score_fn, items)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def submit(self, item):
+        """Score one item as part of the next batch; blocks until it is done."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._enqueue(item), self._loop).result(self.timeout)
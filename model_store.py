@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from forest_engine import FlatForest
+from label_lookup import CompiledEncoders
+
+COMPACT_FORMAT_VERSION = 1
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dump_atomic(obj, path):
+    """joblib.dump to a temporary file, then rename over ``path``.
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    import joblib
+    tmp = f'{path}.tmp-{os.getpid()}'
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def save_compact(path, model, le_dict, model_path=None):
+    """Write the forest as raw .npy arrays plus encoder classes as JSON.
+
+    Loading this needs neither sklearn nor pickle. ``model_path`` records the
+    hash of the pickled model it was exported from, so the app can tell when
+    the two drift apart. The directory is built next to ``path`` and renamed
+    into place: a running app may have the old arrays memory-mapped, so they
+    are moved aside rather than overwritten. Between the two renames ``path``
+    briefly does not exist; ``load_compact`` retries across that gap.
+    """
+    meta = {'format_version': COMPACT_FORMAT_VERSION}
+    if model_path is not None:
+        meta['model_sha256'] = file_sha256(model_path)
+    tmp = f'{path}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp, ignore_errors=True)
+    FlatForest.from_sklearn(model).save_dir(tmp, **meta)
+    with open(os.path.join(tmp, 'encoders.json'), 'w') as f:
+        json.dump(CompiledEncoders(le_dict).classes(), f)
+    old = f'{path}.old-{os.getpid()}'
+    if os.path.exists(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    # Fails harmlessly where mapped files cannot be deleted (Windows)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def _read_compact(path, mmap):
+    meta_path = os.path.join(path, 'forest.json')
+    before = os.stat(meta_path).st_ino
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported compact model version {meta.get('format_version')!r}")
+    forest = FlatForest.load_dir(path, mmap=mmap)
+    with open(os.path.join(path, 'encoders.json')) as f:
+        encoders = CompiledEncoders.from_classes(json.load(f))
+    if os.stat(meta_path).st_ino != before:
+        # save_compact swapped directories mid-read: the files may mix two models
+        raise FileNotFoundError(meta_path)
+    return forest, encoders, meta
+
+
+def load_compact(path, mmap=True, wait=2.0):
+    """Return (forest, encoders, meta); forest arrays are memory-mapped read-only.
+
+    A read that lands in save_compact's directory swap is retried for up to
+    ``wait`` seconds.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return _read_compact(path, mmap)
+        except FileNotFoundError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+
+
+if __name__ == '__main__':
+    import sys
+    import joblib
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'professional_loan_model.pkl'
+    encoders_path = sys.argv[2] if len(sys.argv) > 2 else 'professional_label_encoders.pkl'
+    out_path = sys.argv[3] if len(sys.argv) > 3 else 'professional_loan_compact'
+    save_compact(out_path, joblib.load(model_path), joblib.load(encoders_path), model_path)
+    print(f'Compact model written to {out_path}')
@@ -0,0 +1,180 @@
+"""Business rules for loan applications, compiled to NumPy masks.
+
+A RuleSet evaluates one record or a whole column store in one pass and
+returns reason codes as a bitmask per row: bit ``i`` is set when rule ``i``
+fires. Numeric fields are truncated to integers first, the way the API has
+always parsed them with ``int()``.
+"""
+import argparse
+import json
+import math
+import operator
+
+import numpy as np
+
+_COMPARISONS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+_SCALAR_COMPARISONS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+class Rule:
+    """``field op value``, or ``field op other * factor`` when ``other`` names a field.
+
+    ``op`` is a comparison, or ``in`` / ``not in`` with a tuple of ``value``s.
+    """
+
+    def __init__(self, name, field, op, value=None, other=None, factor=1.0, reason=None):
+        if op not in _COMPARISONS and op not in ('in', 'not in'):
+            raise ValueError(f'unknown operator {op!r} in rule {name!r}')
+        self.name = name
+        self.field = field
+        self.op = op
+        self.value = value
+        self.other = other
+        self.factor = factor
+        self.reason = reason or name.replace('_', ' ').capitalize()
+
+    @property
+    def fields(self):
+        return (self.field,) if self.other is None else (self.field, self.other)
+
+    def mask(self, column):
+        """Boolean array of the rows where the rule fires; ``column(field)`` returns a field's values."""
+        if self.op in ('in', 'not in'):
+            values = column(self.field, numeric=False)
+            hit = np.zeros(len(values), dtype=bool)
+            for value in self.value:
+                hit |= np.asarray(values == value, dtype=bool)
+            return hit if self.op == 'in' else ~hit
+        left = column(self.field)
+        right = self.value if self.other is None else column(self.other) * self.factor
+        return _COMPARISONS[self.op](left, right)
+
+    def fires(self, value):
+        """Scalar twin of ``mask`` for a single record; ``value(field)`` returns one value."""
+        if self.op in ('in', 'not in'):
+            hit = value(self.field, numeric=False) in self.value
+            return hit if self.op == 'in' else not hit
+        right = self.value if self.other is None else value(self.other) * self.factor
+        return _SCALAR_COMPARISONS[self.op](value(self.field), right)
+
+
+class RuleSet:
+    """Ordered rules evaluated together into reason-code bitmasks.
+
+    ``defaults`` fill in fields missing from single records and batches.
+    """
+
+    def __init__(self, rules, defaults=None):
+        self.rules = list(rules)
+        if len(self.rules) > 64:
+            raise ValueError('a RuleSet holds at most 64 rules')
+        self.defaults = dict(defaults or {})
+        self.bits = {rule.name: 1 << i for i, rule in enumerate(self.rules)}
+        self.dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64) if len(self.rules) <= np.iinfo(t).bits)
+        self.fields = sorted({f for rule in self.rules for f in rule.fields})
+
+    def evaluate(self, columns):
+        """Reason codes for every row of ``columns`` (a DataFrame or dict of equal-length arrays)."""
+        n = len(next(iter(columns[f] for f in self.fields if f in columns)))
+        cache = {}
+
+        def column(field, numeric=True):
+            key = (field, numeric)
+            if key not in cache:
+                values = columns[field] if field in columns else np.full(n, self.defaults[field], dtype=object)
+                values = np.asarray(values)
+                if numeric:
+                    values = np.trunc(values.astype(float))
+                cache[key] = values
+            return cache[key]
+
+        codes = np.zeros(n, dtype=self.dtype)
+        for i, rule in enumerate(self.rules):
+            codes |= rule.mask(column).astype(self.dtype) << self.dtype(i)
+        return codes
+
+    def evaluate_records(self, records):
+        """Reason codes for a list of dicts."""
+        columns = {}
+        for field in self.fields:
+            default = self.defaults.get(field)
+            columns[field] = np.array([r.get(field, default) for r in records], dtype=object)
+        return self.evaluate(columns)
+
+    def evaluate_record(self, record):
+        """Reason code (a Python int) for one dict, without going through arrays."""
+        def value(field, numeric=True):
+            v = record.get(field, self.defaults.get(field))
+            return math.trunc(float(v)) if numeric else v
+
+        code = 0
+        for i, rule in enumerate(self.rules):
+            if rule.fires(value):
+                code |= 1 << i
+        return code
+
+    def reasons(self, code):
+        """Reason strings for one code, in rule order."""
+        code = int(code)
+        return [rule.reason for rule in self.rules if code & self.bits[rule.name]]
+
+    def names(self, code):
+        code = int(code)
+        return [rule.name for rule in self.rules if code & self.bits[rule.name]]
+
+    def reason_counts(self, codes):
+        """How many rows each rule fired on, for portfolio-wide reports."""
+        codes = np.asarray(codes)
+        return {rule.name: int(np.count_nonzero(codes & self.bits[rule.name])) for rule in self.rules}
+
+
+# What explain_rejection in app.py reports, with the values it has always
+# assumed for missing fields
+REJECTION_RULES = RuleSet([
+    Rule('low_credit_score', 'credit_score', '<', 650, reason='Low credit score'),
+    Rule('bad_credit_history', 'credit_history', 'in', ('Bad', 0), reason='Bad credit history'),
+    Rule('low_income', 'annual_income', '<', 200, reason='Low annual income'),
+    Rule('high_loan_to_income', 'loan_amount', '>', other='annual_income', factor=0.6,
+         reason='Loan amount is high compared to income'),
+    Rule('short_job_duration', 'years_at_job', '<', 2, reason='Short job duration'),
+    Rule('low_collateral', 'collateral_value', '<', other='loan_amount', factor=0.5,
+         reason='Insufficient collateral value'),
+], defaults={
+    'credit_score': 700, 'credit_history': 'Good', 'annual_income': 500,
+    'loan_amount': 150, 'years_at_job': 5, 'collateral_value': 0,
+})
+
+# The rule generate_professional_dataset.py labels with: approved when no rule
+# fires. Income and loan-to-income are stricter at the boundary than
+# REJECTION_RULES; kept as-is so the shipped dataset reproduces.
+APPROVAL_RULES = RuleSet([
+    Rule('low_credit_score', 'credit_score', '<', 650),
+    Rule('bad_credit_history', 'credit_history', 'not in', ('Good',)),
+    Rule('low_income', 'annual_income', '<=', 200),
+    Rule('high_loan_to_income', 'loan_amount', '>=', other='annual_income', factor=0.6),
+    Rule('short_job_duration', 'years_at_job', '<', 2),
+    Rule('low_collateral', 'collateral_value', '<', other='loan_amount', factor=0.5),
+])
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Count how often each rejection rule fires across a CSV of applications.')
+    parser.add_argument('input')
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    counts = dict.fromkeys(REJECTION_RULES.bits, 0)
+    rows = flagged = 0
+    for chunk in pd.read_csv(args.input, usecols=REJECTION_RULES.fields, chunksize=args.chunksize):
+        codes = REJECTION_RULES.evaluate(chunk)
+        for name, count in REJECTION_RULES.reason_counts(codes).items():
+            counts[name] += count
+        rows += len(chunk)
+        flagged += int(np.count_nonzero(codes))
+    print(json.dumps({'rows': rows, 'flagged': flagged, 'reasons': counts}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from explanations import CachedExplainer, top_k_reasons
+from label_lookup import CompiledEncoders
+from sinks import open_sink
+
+model_features = ['age', 'gender', 'married', 'dependents', 'education', 'employment_type', 'years_at_job', 'annual_income', 'coapplicant_income', 'credit_score', 'credit_history', 'loan_amount', 'loan_amount_term', 'loan_purpose', 'property_area', 'collateral_value']
+
+# Per-process state, filled in by init_worker
+_worker = {}
+
+
+def init_worker(model_path, encoders_path, reasons):
+    model = joblib.load(model_path)
+    # Parallelism comes from the process pool, not from joblib inside it
+    model.n_jobs = 1
+    encoders = CompiledEncoders(joblib.load(encoders_path))
+    _worker['model'] = model
+    _worker['encoders'] = encoders
+    _worker['labels'] = encoders.decode('loan_status', model.classes_)
+    _worker['approved_col'] = int(np.flatnonzero(_worker['labels'] == 'Approved')[0])
+    _worker['explainer'] = None
+    if reasons:
+        import shap
+        _worker['explainer'] = CachedExplainer(shap.TreeExplainer(model), class_index=_worker['approved_col'])
+    _worker['reasons'] = reasons
+
+
+def score_chunk(chunk, start_row):
+    model = _worker['model']
+    encoders = _worker['encoders']
+    try:
+        columns = {f: encoders[f].encode_column(chunk[f].to_numpy()) if f in encoders else chunk[f].to_numpy() for f in model_features}
+    except ValueError as e:
+        raise ValueError(f'chunk starting at row {start_row}: {e}') from None
+    X = pd.DataFrame(columns, columns=model_features)
+    proba = model.predict_proba(X)
+
+    out = chunk.copy()
+    out['decision'] = _worker['labels'][proba.argmax(axis=1)]
+    out['approval_probability'] = proba[:, _worker['approved_col']].round(4)
+    if _worker['explainer'] is not None:
+        shap_values = _worker['explainer'].shap_values(X.to_numpy())
+        out['top_reasons'] = [
+            '; '.join(top_k_reasons(shap_row, list(row), model_features, _worker['reasons']))
+            for shap_row, row in zip(shap_values, X.itertuples(index=False))
+        ]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a CSV of loan applications in bounded memory.')
+    parser.add_argument('input', help='CSV shaped like professional_loan_dataset.csv')
+    parser.add_argument('output', help='Output .csv or .parquet file')
+    parser.add_argument('--model', default='professional_loan_model.pkl')
+    parser.add_argument('--encoders', default='professional_label_encoders.pkl')
+    parser.add_argument('--format', choices=['csv', 'parquet'], help='Defaults to the output file extension')
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--reasons', type=int, default=0, metavar='K',
+                        help='Also write the top K SHAP reasons per row (slow)')
+    args = parser.parse_args()
+
+    sink = open_sink(args.output, args.format)
+    # Keep at most a couple of chunks per worker in flight so memory stays flat
+    max_inflight = 2 * args.workers
+    pending = deque()
+    rows = 0
+    start = time.perf_counter()
+
+    def drain_one():
+        nonlocal rows
+        scored = pending.popleft().result()
+        sink.write(scored)
+        rows += len(scored)
+        elapsed = time.perf_counter() - start
+        print(f'{rows} rows scored, {rows / elapsed:,.0f} rows/sec', file=sys.stderr)
+
+    with ProcessPoolExecutor(args.workers, initializer=init_worker,
+                             initargs=(args.model, args.encoders, args.reasons)) as pool:
+        offset = 0
+        for chunk in pd.read_csv(args.input, chunksize=args.chunksize):
+            pending.append(pool.submit(score_chunk, chunk, offset))
+            offset += len(chunk)
+            if len(pending) >= max_inflight:
+                drain_one()
+        while pending:
+            drain_one()
+    sink.close()
+
+    elapsed = time.perf_counter() - start
+    print(f'Scored {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec) -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import gc
+import os
+
+
+def warm_up(flask_app):
+    # Run one request through the app so every lazily built structure exists
+    # in the parent before workers are forked from it.
+    sample = {
+        'age': 30, 'gender': 'Male', 'married': 'Yes', 'dependents': 0,
+        'education': 'Graduate', 'employment_type': 'Salaried', 'years_at_job': 5,
+        'annual_income': 500, 'coapplicant_income': 0, 'credit_score': 700,
+        'credit_history': 'Good', 'loan_amount': 150, 'loan_amount_term': 360,
+        'loan_purpose': 'Home', 'property_area': 'Urban', 'collateral_value': 100,
+    }
+    response = flask_app.test_client().post('/predict', json=sample)
+    if response.status_code != 200:
+        raise RuntimeError(f'Warm-up prediction failed: {response.get_json()}')
+
+
+def load_app():
+    # Load the sklearn model and SHAP explainer up front so workers share them
+    os.environ.setdefault('PRELOAD_EXPLAINER', '1')
+    from app import app as flask_app
+    warm_up(flask_app)
+    # Move everything allocated so far out of the collector's reach so that
+    # garbage collection in the workers does not touch (and copy) shared pages.
+    gc.collect()
+    gc.freeze()
+    return flask_app
+
+
+def run_gunicorn(flask_app, bind, workers, threads, timeout):
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('timeout', timeout)
+            # The app is already imported in this (parent) process, so workers
+            # inherit the model, encoders and explainer copy-on-write.
+            self.cfg.set('preload_app', True)
+
+        def load(self):
+            return flask_app
+
+    PreloadedApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the loan approval API with preloaded, shared model workers.')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WORKER_THREADS', 1)))
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WORKER_TIMEOUT', 60)))
+    args = parser.parse_args()
+
+    print(f'Loading model once in parent process {os.getpid()}...')
+    flask_app = load_app()
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        # gunicorn is POSIX only; fall back to a threaded single process
+        print('gunicorn is not available, serving with a threaded single-process server')
+        from werkzeug.serving import run_simple
+        host, _, port = args.bind.rpartition(':')
+        run_simple(host or '0.0.0.0', int(port), flask_app, threaded=True)
+        return
+
+    print(f'Starting {args.workers} workers x {args.threads} threads on {args.bind}')
+    run_gunicorn(flask_app, args.bind, args.workers, args.threads, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Chunked CSV / Parquet writers shared by the command-line scripts."""
+import sys
+
+
+class CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode='w' if self.header else 'a', header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            sys.exit('Parquet output needs pyarrow: pip install pyarrow')
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Later chunks may infer different dtypes; keep the first chunk's schema
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_sink(path, fmt=None):
+    """Sink for ``fmt`` ('csv' or 'parquet'), defaulting to the file extension."""
+    fmt = fmt or ('parquet' if path.endswith('.parquet') else 'csv')
+    return ParquetSink(path) if fmt == 'parquet' else CsvSink(path)
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from forest_engine import FlatForest  # noqa: E402
+from model_store import load_compact, save_compact  # noqa: E402
+from train import DATASETS, fit_encoders, load_dataset  # noqa: E402
+
+CONFIG = DATASETS['professional']
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    # The model pickle is not shipped, so fit a small forest on the shipped data
+    df = load_dataset(CONFIG, os.path.join(ROOT, CONFIG['csv']))
+    le_dict = fit_encoders(df)
+    X = df.drop(columns=CONFIG['target'])
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, df[CONFIG['target']])
+    return model, le_dict, X
+
+
+def test_predict_proba_matches_sklearn(fitted):
+    model, _, X = fitted
+    forest = FlatForest.from_sklearn(model)
+    assert np.array_equal(forest.predict_proba(X.to_numpy()), model.predict_proba(X))
+    assert np.array_equal(forest.predict(X.to_numpy()), model.predict(X))
+
+
+def test_compact_round_trip(fitted, tmp_path):
+    model, le_dict, X = fitted
+    path = str(tmp_path / 'compact')
+    save_compact(path, model, le_dict)
+    forest, encoders, _ = load_compact(path)
+    assert np.array_equal(forest.predict_proba(X.to_numpy()), model.predict_proba(X))
+    assert encoders.decode('loan_status', forest.classes).tolist() == le_dict['loan_status'].classes_.tolist()
@@ -0,0 +1,71 @@
+import os
+import sys
+import warnings
+
+import joblib
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from label_lookup import CompiledEncoders, LabelLookup, UnknownCategoryError  # noqa: E402
+
+with warnings.catch_warnings():
+    # The shipped pickle may come from another sklearn version
+    warnings.simplefilter('ignore')
+    LE_DICT = joblib.load(os.path.join(ROOT, 'professional_label_encoders.pkl'))
+
+FIELDS = sorted(LE_DICT)
+
+
+@pytest.fixture(scope='module')
+def encoders():
+    return CompiledEncoders(LE_DICT)
+
+
+@pytest.mark.parametrize('field', FIELDS)
+def test_encode_matches_label_encoder(encoders, field):
+    le = LE_DICT[field]
+    lookup = encoders[field]
+    expected = le.transform(le.classes_)
+    for value, code in zip(le.classes_, expected):
+        assert lookup.encode(value) == code
+    assert np.array_equal(lookup.encode_column(list(le.classes_)), expected)
+    # Repeated and shuffled values, as a batch would send them
+    values = np.random.default_rng(0).choice(le.classes_, 500)
+    assert np.array_equal(lookup.encode_column(values.tolist()), le.transform(values))
+
+
+@pytest.mark.parametrize('field', FIELDS)
+def test_decode_matches_label_encoder(encoders, field):
+    le = LE_DICT[field]
+    codes = np.arange(len(le.classes_))
+    assert encoders.decode(field, codes).tolist() == le.inverse_transform(codes).tolist()
+
+
+@pytest.mark.parametrize('field', FIELDS)
+def test_unknown_value_raises(encoders, field):
+    with pytest.raises(UnknownCategoryError) as record_error:
+        encoders.encode_record({field: 'not-a-category'}, [field])
+    assert record_error.value.field == field
+    assert record_error.value.row is None
+
+    values = list(LE_DICT[field].classes_) + ['not-a-category']
+    with pytest.raises(UnknownCategoryError) as column_error:
+        encoders.encode_columns([{field: v} for v in values], [field])
+    assert column_error.value.row == len(values) - 1
+    assert column_error.value.value == 'not-a-category'
+
+
+def test_appended_classes_keep_codes():
+    # train.py --update appends new categories after the fitted, sorted ones
+    classes = list(LE_DICT['employment_type'].classes_) + ['Contract', 'Apprentice']
+    lookup = LabelLookup('employment_type', classes)
+    codes = np.arange(len(classes))
+    assert [lookup.encode(c) for c in classes] == codes.tolist()
+    assert lookup.encode_column(classes[::-1]).tolist() == codes[::-1].tolist()
+    assert lookup.decode(codes).tolist() == classes
+
+    restored = CompiledEncoders.from_classes({'employment_type': classes})
+    assert restored.decode('employment_type', lookup.encode_column(classes)).tolist() == classes
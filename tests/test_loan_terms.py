@@ -0,0 +1,47 @@
+import os
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from loan_terms import DEFAULT_RATE_TABLE, calculate_loan_terms, loan_terms  # noqa: E402
+
+# Every tier boundary and its neighbours, plus the ends of the score range
+BOUNDARY_SCORES = [300, 649, 650, 651, 699, 700, 701, 749, 750, 751, 799, 800, 801, 900]
+
+
+@pytest.fixture(scope='module')
+def loans():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    amounts = rng.integers(10, 800, n).astype(float)
+    amounts[::7] += 0.5
+    terms = rng.choice([12, 60, 180, 240, 300, 360, 480], n)
+    scores = np.concatenate([rng.integers(300, 900, n - len(BOUNDARY_SCORES)), BOUNDARY_SCORES])
+    return amounts, terms, scores
+
+
+def test_loan_terms_matches_scalar(loans):
+    amounts, terms, scores = loans
+    vectorized = loan_terms(amounts, terms, scores)
+    scalar = [calculate_loan_terms(a, t, s) for a, t, s in zip(amounts.tolist(), terms.tolist(), scores.tolist())]
+    for key in ('interest_rate', 'emi', 'total_payment'):
+        assert np.array_equal(vectorized[key], [row[key] for row in scalar]), key
+
+
+def test_rate_matches_lookup(loans):
+    scores = np.concatenate([loans[2], np.array(BOUNDARY_SCORES) - 0.5])
+    expected = DEFAULT_RATE_TABLE.lookup(scores)
+    assert [DEFAULT_RATE_TABLE.rate(s) for s in scores.tolist()] == expected.tolist()
+
+
+def test_zero_term_is_inf_and_nan_without_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result = loan_terms([100.0, 100.0], [0, 360], [720, 720])
+    assert np.isinf(result['emi'][0]) and np.isnan(result['total_payment'][0])
+    assert np.isfinite(result['emi'][1]) and np.isfinite(result['total_payment'][1])
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rules import APPROVAL_RULES, REJECTION_RULES  # noqa: E402
+
+FALLBACK = ['General risk factors based on application']
+
+
+def explain_rejection_baseline(data):
+    # The if-chain app.py used before rules.py, kept verbatim as the reference
+    reasons = []
+    if data.get('credit_score', 700) < 650:
+        reasons.append('Low credit score')
+    if data.get('credit_history', 'Good') in ['Bad', 0]:
+        reasons.append('Bad credit history')
+    if int(data.get('annual_income', 500)) < 200:
+        reasons.append('Low annual income')
+    if int(data.get('loan_amount', 150)) > int(data.get('annual_income', 500)) * 0.6:
+        reasons.append('Loan amount is high compared to income')
+    if int(data.get('years_at_job', 5)) < 2:
+        reasons.append('Short job duration')
+    if int(data.get('collateral_value', 0)) < int(data.get('loan_amount', 150)) * 0.5:
+        reasons.append('Insufficient collateral value')
+    return reasons or FALLBACK
+
+
+def random_records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    histories = ['Good', 'Bad', 0, 1, 0.0]
+    records = []
+    for _ in range(n):
+        record = {
+            'credit_score': int(rng.integers(550, 800)),
+            'credit_history': histories[rng.integers(len(histories))],
+            'annual_income': int(rng.integers(100, 400)),
+            'loan_amount': int(rng.integers(20, 300)),
+            'years_at_job': int(rng.integers(0, 6)),
+            'collateral_value': int(rng.integers(0, 300)),
+        }
+        for field in list(record):
+            draw = rng.random()
+            if draw < 0.1:
+                del record[field]
+            elif draw < 0.3 and field != 'credit_history':
+                # Fractional values exercise the int() truncation
+                record[field] += float(rng.choice([0.25, 0.5, 0.99]))
+        records.append(record)
+    # Exact boundaries of every rule
+    records += [
+        {'credit_score': 650}, {'credit_score': 649.99},
+        {'annual_income': 200}, {'annual_income': 199.9},
+        {'loan_amount': 300, 'annual_income': 500}, {'loan_amount': 301, 'annual_income': 500},
+        {'years_at_job': 2}, {'years_at_job': 1.99},
+        {'collateral_value': 75, 'loan_amount': 150}, {'collateral_value': 74.9, 'loan_amount': 150},
+        {},
+    ]
+    return records
+
+
+@pytest.fixture(scope='module')
+def records():
+    return random_records(20_000)
+
+
+def test_evaluate_record_matches_baseline(records):
+    for record in records:
+        reasons = REJECTION_RULES.reasons(REJECTION_RULES.evaluate_record(record)) or FALLBACK
+        assert reasons == explain_rejection_baseline(record), record
+
+
+def test_evaluate_records_matches_baseline(records):
+    codes = REJECTION_RULES.evaluate_records(records)
+    for record, code in zip(records, codes):
+        assert (REJECTION_RULES.reasons(code) or FALLBACK) == explain_rejection_baseline(record), record
+
+
+def test_approval_rules_reproduce_shipped_labels():
+    df = pd.read_csv(os.path.join(ROOT, 'professional_loan_dataset.csv'))
+    approved = APPROVAL_RULES.evaluate(df) == 0
+    assert np.array_equal(approved, (df['loan_status'] == 'Approved').to_numpy())
@@ -0,0 +1,303 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from instrumentation import peak_rss_mb
+from model_store import dump_atomic, file_sha256, save_compact
+
+ARTIFACT_VERSION = 1
+
+# Explicit, compact dtypes for the datasets shipped with the repo
+DATASETS = {
+    'professional': {
+        'csv': 'professional_loan_dataset.csv',
+        'dtypes': {
+            'age': 'int16', 'gender': 'category', 'married': 'category', 'dependents': 'int16',
+            'education': 'category', 'employment_type': 'category', 'years_at_job': 'int16',
+            'annual_income': 'int32', 'coapplicant_income': 'int32', 'credit_score': 'int16',
+            'credit_history': 'category', 'loan_amount': 'int32', 'loan_amount_term': 'int16',
+            'loan_purpose': 'category', 'property_area': 'category', 'collateral_value': 'int32',
+            'loan_status': 'category',
+        },
+        'drop': [],
+        'target': 'loan_status',
+        'test_size': 0.2,
+        'artifact': 'professional_loan_artifact.joblib',
+        # Files the Flask app and older tooling load directly
+        'model_file': 'professional_loan_model.pkl',
+        'encoders_file': 'professional_label_encoders.pkl',
+        'compact_dir': 'professional_loan_compact',
+    },
+    'legacy': {
+        'csv': 'loan_approval_dataset_large.csv',
+        'dtypes': {
+            'applicant_id': 'string', 'gender': 'category', 'married': 'category', 'dependents': 'int16',
+            'education': 'category', 'self_employed': 'category', 'applicant_income': 'int32',
+            'coapplicant_income': 'int32', 'loan_amount': 'int32', 'loan_amount_term': 'int16',
+            'credit_history': 'int8', 'property_area': 'category', 'loan_status': 'category',
+        },
+        'drop': ['applicant_id'],
+        'target': 'loan_status',
+        'test_size': 0.0,
+        'artifact': 'loan_artifact.joblib',
+        'model_file': 'loan_model.pkl',
+        'encoders_file': None,
+        'compact_dir': None,
+    },
+}
+
+
+def load_dataset(config, csv_path=None):
+    path = csv_path or config['csv']
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: t for c, t in config['dtypes'].items() if c in header}
+    df = pd.read_csv(path, dtype=dtypes)
+    return df.drop(columns=[c for c in config['drop'] if c in df.columns])
+
+
+def fit_encoders(df):
+    """One LabelEncoder per categorical column, fitted on its categories only."""
+    le_dict = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            le = LabelEncoder()
+            le.fit(np.asarray(df[col].cat.categories, dtype=object))
+            le_dict[col] = le
+            # Same codes LabelEncoder.transform would give, without re-scanning strings
+            df[col] = pd.Categorical(df[col], categories=le.classes_).codes.astype(np.int16)
+    return le_dict
+
+
+def extend_encoders(le_dict, df, target=None, allow_new=True):
+    """Encode ``df`` in place with fitted encoders, appending unseen categories.
+
+    New classes go after the existing ones, so every code the current trees
+    were fitted on keeps its meaning. Returns {column: [new categories]}.
+    Raises ValueError for unseen target labels, or any unseen category when
+    ``allow_new`` is false.
+    """
+    added = {}
+    for col, le in le_dict.items():
+        if col not in df.columns:
+            continue
+        known = set(le.classes_.tolist())
+        values = df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype) else pd.unique(df[col])
+        new = sorted(v for v in values.tolist() if v not in known)
+        if new:
+            if col == target:
+                raise ValueError(f'unknown {col} labels {new}; the forest cannot learn new classes incrementally')
+            if not allow_new:
+                raise ValueError(f'unknown values {new} for {col!r} (expected one of {le.classes_.tolist()})')
+            le.classes_ = np.concatenate([le.classes_, np.asarray(new, dtype=le.classes_.dtype)])
+            added[col] = new
+        df[col] = pd.Categorical(df[col], categories=le.classes_).codes.astype(np.int16)
+    return added
+
+
+def save_outputs(artifact, config, out_dir):
+    """Write the artifact and the files the app loads; returns (artifact_path, model_path).
+
+    Every file is replaced atomically, and the compact model last: a running
+    app watching it only reloads once the rest is in place.
+    """
+    artifact_path = os.path.join(out_dir, config['artifact'])
+    dump_atomic(artifact, artifact_path)
+
+    # Keep the individual files the app and scripts already load
+    model_path = os.path.join(out_dir, config['model_file'])
+    dump_atomic(artifact['model'], model_path)
+    if config['encoders_file']:
+        dump_atomic(artifact['encoders'], os.path.join(out_dir, config['encoders_file']))
+    if config['compact_dir']:
+        # Fast-loading copy the app serves from without unpickling
+        save_compact(os.path.join(out_dir, config['compact_dir']), artifact['model'], artifact['encoders'], model_path)
+    return artifact_path, model_path
+
+
+def train(name, csv_path=None, n_estimators=100, n_jobs=-1, random_state=42, out_dir='.'):
+    config = DATASETS[name]
+    start = time.perf_counter()
+
+    df = load_dataset(config, csv_path)
+    load_time = time.perf_counter() - start
+    le_dict = fit_encoders(df)
+
+    X = df.drop(config['target'], axis=1)
+    y = df[config['target']]
+    if config['test_size']:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=config['test_size'], random_state=random_state)
+    else:
+        X_train, X_test, y_train, y_test = X, None, y, None
+
+    fit_start = time.perf_counter()
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - fit_start
+    # Single-row serving is faster without joblib dispatch
+    model.n_jobs = None
+
+    metrics = {'train_accuracy': float(model.score(X_train, y_train))}
+    if X_test is not None:
+        metrics['test_accuracy'] = float(model.score(X_test, y_test))
+
+    artifact = {
+        'format_version': ARTIFACT_VERSION,
+        'model': model,
+        'encoders': le_dict,
+        'features': list(X.columns),
+        'target': config['target'],
+        'metadata': {
+            'dataset': name,
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'rows': int(len(df)),
+            'n_estimators': n_estimators,
+            'random_state': random_state,
+            'sklearn_version': sklearn.__version__,
+            'metrics': metrics,
+        },
+    }
+    artifact_path, _ = save_outputs(artifact, config, out_dir)
+
+    report = {
+        **metrics,
+        'rows': int(len(df)),
+        'load_seconds': round(load_time, 3),
+        'fit_seconds': round(fit_time, 3),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'dataset_memory_mb': round(df.memory_usage(deep=True).sum() / 2 ** 20, 2),
+        'model_size_mb': round(os.path.getsize(artifact_path) / 2 ** 20, 2),
+        'n_nodes': int(sum(est.tree_.node_count for est in model.estimators_)),
+        'artifact': artifact_path,
+        'artifact_sha256': file_sha256(artifact_path),
+    }
+    return artifact, report
+
+
+def load_artifact(path):
+    artifact = joblib.load(path)
+    version = artifact.get('format_version') if isinstance(artifact, dict) else None
+    if version != ARTIFACT_VERSION:
+        raise ValueError(f'{path}: unsupported artifact version {version!r} (expected {ARTIFACT_VERSION})')
+    return artifact
+
+
+def update(name, csv_path, add_trees=10, max_trees=None, n_jobs=-1, allow_new_categories=True, out_dir='.'):
+    """Grow the saved forest with ``add_trees`` trees fitted on a new chunk only.
+
+    Uses warm_start, so existing trees are kept as they are. With
+    ``max_trees`` the oldest trees are retired first-in first-out, giving a
+    sliding window over the chunks seen so far.
+    """
+    config = DATASETS[name]
+    start = time.perf_counter()
+    artifact = load_artifact(os.path.join(out_dir, config['artifact']))
+    model, le_dict = artifact['model'], artifact['encoders']
+    target = artifact['target']
+
+    df = load_dataset(config, csv_path)
+    missing = [c for c in artifact['features'] + [target] if c not in df.columns]
+    if missing:
+        raise ValueError(f'{csv_path}: missing columns {missing}')
+    new_categories = extend_encoders(le_dict, df, target, allow_new_categories)
+    X = df[artifact['features']]
+    y = df[target]
+    if len(np.unique(y)) != len(model.classes_):
+        # fit() would re-derive classes_ and break the existing trees
+        raise ValueError(f'{csv_path}: every {target} class must appear in an update chunk')
+    accuracy_before = float(model.score(X, y))
+
+    updates = artifact['metadata'].setdefault('updates', [])
+    # Fresh, reproducible seeds per update: retiring trees would otherwise
+    # make warm_start hand out seeds already used by earlier updates
+    seed = int(np.random.SeedSequence(artifact['metadata']['random_state'], spawn_key=(len(updates) + 1,)).generate_state(1)[0])
+    fit_start = time.perf_counter()
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees, n_jobs=n_jobs, random_state=seed)
+    model.fit(X, y)
+    fit_time = time.perf_counter() - fit_start
+    retired = 0
+    if max_trees and len(model.estimators_) > max_trees:
+        retired = len(model.estimators_) - max_trees
+        model.estimators_ = model.estimators_[retired:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_), n_jobs=None)
+
+    metrics = {'chunk_accuracy_before': accuracy_before, 'chunk_accuracy_after': float(model.score(X, y))}
+    updates.append({
+        'updated_at': datetime.now(timezone.utc).isoformat(),
+        'csv': csv_path,
+        'rows': int(len(df)),
+        'added_trees': add_trees,
+        'retired_trees': retired,
+        'new_categories': new_categories,
+        'seed': seed,
+        'metrics': metrics,
+    })
+    artifact['metadata']['n_estimators'] = len(model.estimators_)
+    artifact['metadata']['sklearn_version'] = sklearn.__version__
+    artifact_path, _ = save_outputs(artifact, config, out_dir)
+
+    report = {
+        **metrics,
+        'rows': int(len(df)),
+        'n_estimators': len(model.estimators_),
+        'added_trees': add_trees,
+        'retired_trees': retired,
+        'new_categories': new_categories,
+        'fit_seconds': round(fit_time, 3),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'artifact': artifact_path,
+        'artifact_sha256': file_sha256(artifact_path),
+    }
+    return artifact, report
+
+
+def main(argv=None, default_dataset='professional'):
+    parser = argparse.ArgumentParser(description='Train a loan approval model and save a versioned artifact.')
+    parser.add_argument('--dataset', choices=sorted(DATASETS), default=default_dataset)
+    parser.add_argument('--csv', help='Override the dataset CSV path')
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Cores used to fit trees (-1 = all)')
+    parser.add_argument('--random-state', type=int, default=42)
+    parser.add_argument('--out-dir', default='.')
+    incremental = parser.add_argument_group('incremental training (--update)')
+    incremental.add_argument('--update', action='store_true',
+                             help='Add trees fitted on --csv to the artifact in --out-dir instead of retraining')
+    incremental.add_argument('--add-trees', type=int, default=10)
+    incremental.add_argument('--max-trees', type=int, help='Retire the oldest trees beyond this many')
+    incremental.add_argument('--strict-categories', action='store_true',
+                             help='Fail on categories the encoders have not seen instead of adding them')
+    args = parser.parse_args(argv)
+
+    if args.update:
+        if not args.csv:
+            parser.error('--update needs --csv with the new labelled applications')
+        try:
+            _, report = update(args.dataset, args.csv, args.add_trees, args.max_trees, args.n_jobs,
+                               not args.strict_categories, args.out_dir)
+        except ValueError as e:
+            parser.error(str(e))
+        print(json.dumps(report, indent=2))
+        print('Model and encoders updated.')
+        return
+
+    _, report = train(args.dataset, args.csv, args.n_estimators, args.n_jobs, args.random_state, args.out_dir)
+    if 'test_accuracy' in report:
+        print('Train accuracy:', report['train_accuracy'])
+        print('Test accuracy:', report['test_accuracy'])
+    print(json.dumps(report, indent=2))
+    print('Model and encoders saved.')
+
+
+if __name__ == '__main__':
+    main()